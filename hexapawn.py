@@ -1,8 +1,33 @@
+import asyncio
+import bz2
+import gzip
+import lzma
 from abc import ABC
-from json import dumps, loads
-from random import choice, random
+from argparse import ArgumentParser
+from bisect import bisect_right
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import accumulate
+from json import JSONDecoder, dumps, loads
+from math import exp, log, log10, sqrt
+from multiprocessing import Process
+from multiprocessing.shared_memory import SharedMemory
+from os import listdir, makedirs, path, remove, replace, stat
+from random import Random, choice, random
+from random import getstate, setstate
+from signal import SIGINT, signal
+from statistics import NormalDist
+from random import seed as seedRandom
+from threading import Thread
+from tracemalloc import get_traced_memory
+from tracemalloc import start as startTracing
+from tracemalloc import stop as stopTracing
 from time import ctime, strftime
-from time import perf_counter
+from time import perf_counter, sleep
 from tkinter import *
 from tkinter import filedialog
 from tkinter.filedialog import *
@@ -17,6 +42,9 @@ except ModuleNotFoundError:
     print("Libraries numpy and matplotlib could not be found. You won't be able to compare AI or view benchmark progress.")
 else: chartsAvailable = True
 
+# Column letters used in move strings, such as "A3>A2". Boards can be up to 26 columns wide.
+columnLetters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
 class Pawn(ABC):
     """
     Base Class for all pawns in the game.
@@ -28,7 +56,11 @@ class Pawn(ABC):
     `moveCheck` - Defines whether to check spaces above (-1) or below (1) itself on a board.
 
     `isPlayer` - Defines if the piece is used by the player or CPU.
+
+    Pawns use `__slots__`, so they have no `__dict__` and new attributes can't be added to them.
     """
+    __slots__ = ("posX", "posY", "label", "_moveCheck", "isPlayer")
+
     def __init__(self, posX: int, posY: int, label: str = "nil", moveCheck: int = 0, isPlayer: bool = False) -> None:
         self.posX = posX
         self.posY = posY
@@ -55,7 +87,8 @@ class Pawn(ABC):
         try: forward = board.board[self.posX+self._moveCheck][self.posY]
         except IndexError: moves[1] = False # "Out of Index"
         else:
-            if forward == '   ': moves[1] = True
+            if self.posX+self._moveCheck < 0: moves[1] = False # "Not in range"
+            elif forward == '   ': moves[1] = True
             else: moves[1] = False # "Occupied"
 
         try: diagonalLeft = board.board[self.posX+self._moveCheck][self.posY-1]
@@ -71,7 +104,7 @@ class Pawn(ABC):
         try: diagonalRight = board.board[self.posX+self._moveCheck][self.posY+1]
         except IndexError: moves[2] = False # "Out of Index"
         else:
-            if self.posX+self._moveCheck < 0 or self.posY+1 > 2: moves[2] = False # "Not in range"
+            if self.posX+self._moveCheck < 0 or self.posY+1 > len(board.board[0])-1: moves[2] = False # "Not in range"
             elif diagonalRight == '   ': moves[2] = False # "Unoccupied"
             else:
                 if self.isPlayer == (not diagonalRight.isPlayer):
@@ -100,6 +133,8 @@ class WhitePawn(Pawn):
     
     Defaults: `moveCheck = -1, isPlayer = True`
     """
+    __slots__ = ()
+
     def __init__(self, posX: int, posY: int, label: str = "WPx") -> None:
         super().__init__(posX, posY, label, moveCheck=-1, isPlayer=True)
 
@@ -109,19 +144,31 @@ class BlackPawn(Pawn):
     
     Defaults: `moveCheck = 1, isPlayer = False`
     """
+    __slots__ = ()
+
     def __init__(self, posX: int, posY: int, label: str = "BPx") -> None:
         super().__init__(posX, posY, label, moveCheck=1, isPlayer=False)
 
 class hexBoard():
     """
-    A 3-by-3 board object used to map pawns and play Hexapawn
+    A board object used to map pawns and play Hexapawn
+
+    `rows, columns` - The size of the board. Hexapawn is played on a 3-by-3 board, and larger sizes play variants such as Octapawn (4-by-4). Each side starts with a full row of pawns.
+
+    The board creates its pawns once, in `pieces`, and reuses them whenever it is reset or loaded, so a board can be reused for any number of games.
+
+    Moves made with `makeMove()` are kept until the board is reset or loaded, and `unmakeMove()` takes them back. They are stored in `moveStack`, an array made once with room for the longest possible game, as the source and target coordinates and the captured pawn's index in `pieces` (-1 for none). `movesMade` is the number of moves stored.
     """
-    def __init__(self) -> None:
-        self.board = [
-            [BlackPawn(0,0,"BP1"),BlackPawn(0,1,"BP2"),BlackPawn(0,2,"BP3")],
-            ["   ","   ","   "],
-            [WhitePawn(2,0,"WP1"),WhitePawn(2,1,"WP2"),WhitePawn(2,2,"WP3")]
-        ]
+    def __init__(self, rows: int = 3, columns: int = 3) -> None:
+        if rows < 3: raise ValueError("Argument rows must be an integer above 2.")
+        if columns < 1 or columns > len(columnLetters): raise ValueError(f"Argument columns must be an integer between 1 and {len(columnLetters)}.")
+        self.rows = rows
+        self.columns = columns
+        self.pieces = tuple(BlackPawn(0,y,f"BP{y+1}") for y in range(columns)) + tuple(WhitePawn(rows-1,y,f"WP{y+1}") for y in range(columns))
+        self.board = [["   "]*columns for x in range(rows)]
+        self.moveStack = array('h', [0])*(5*2*columns*(rows-1)) # Every move takes a pawn one row forward
+        self.movesMade = 0
+        self.reset()
     
     def displayBoard(self) -> None:
         """
@@ -137,14 +184,12 @@ class hexBoard():
                     data.append(square.label)
                 else: data.append("   ")
             labels.append(data)
-        print("    A   B   C")
-        print("  +---+---+---+")
-        print(f"1 |{labels[0][0]}|{labels[0][1]}|{labels[0][2]}|")
-        print("  +---+---+---+")
-        print(f"2 |{labels[1][0]}|{labels[1][1]}|{labels[1][2]}|")
-        print("  +---+---+---+")
-        print(f"3 |{labels[2][0]}|{labels[2][1]}|{labels[2][2]}|")
-        print("  +---+---+---+")
+        divider = "  +"+"---+"*self.columns
+        print("    "+"   ".join(columnLetters[:self.columns]))
+        print(divider)
+        for x in range(self.rows):
+            print(f"{x+1} |"+"|".join(labels[x])+"|")
+            print(divider)
     
     def __configPiece(self, x, y) -> None:
         """Sets the position of a pawn, if there is one there."""
@@ -166,6 +211,45 @@ class hexBoard():
         self.board[targetX][targetY] = self.board[sourceX][sourceY]
         self.board[sourceX][sourceY] = "   "
         self.__configPiece(targetX,targetY)
+
+    def makeMove(self, sourceX: int, sourceY: int, targetX: int, targetY: int) -> None:
+        """
+        Moves the contents of the source coordinates to the target coordinates like `overwriteAndMove()`, and records the move and any captured pawn on `moveStack` so it can be undone.
+
+        Moves made with `overwriteAndMove()` aren't recorded, so don't mix the two between resets if moves will be undone. `ComputerPlayer.applyMove()` always uses this method.
+        """
+        board = self.board
+        stack = self.moveStack
+        offset = self.movesMade*5
+        if offset == len(stack): stack.extend(stack)
+        captured = board[targetX][targetY]
+        stack[offset] = sourceX
+        stack[offset+1] = sourceY
+        stack[offset+2] = targetX
+        stack[offset+3] = targetY
+        stack[offset+4] = -1 if captured == "   " else self.pieces.index(captured)
+        self.movesMade += 1
+        piece = board[sourceX][sourceY]
+        board[targetX][targetY] = piece
+        board[sourceX][sourceY] = "   "
+        piece.changePos(targetX, targetY)
+
+    def unmakeMove(self) -> tuple:
+        """
+        Takes back the last move made with `makeMove()`, putting back any pawn it captured.
+
+        Returns the move's source and target coordinates. Raises a `RuntimeError` if there are no moves to take back.
+        """
+        if self.movesMade == 0: raise RuntimeError("There are no moves to undo.")
+        self.movesMade -= 1
+        offset = self.movesMade*5
+        sourceX, sourceY, targetX, targetY, captured = self.moveStack[offset:offset+5]
+        board = self.board
+        piece = board[targetX][targetY]
+        board[sourceX][sourceY] = piece
+        board[targetX][targetY] = "   " if captured < 0 else self.pieces[captured]
+        piece.changePos(sourceX, sourceY)
+        return (sourceX, sourceY, targetX, targetY)
     
     def returnCaptureString(self) -> str:
         """
@@ -183,13 +267,80 @@ class hexBoard():
                 else: output += "o"
         return output
     
+    def loadCaptureString(self, layout: str) -> None:
+        """Sets the board to match a layout string produced by `returnCaptureString()`, reusing the board's pawns."""
+        self.movesMade = 0
+        whiteCount, blackCount = (self.columns,0)
+        for i in range(self.rows*self.columns):
+            x, y = divmod(i, self.columns)
+            if layout[i] == "w":
+                piece = self.pieces[whiteCount]
+                whiteCount += 1
+            elif layout[i] == "b":
+                piece = self.pieces[blackCount]
+                blackCount += 1
+            else:
+                self.board[x][y] = "   "
+                continue
+            piece.changePos(x, y)
+            self.board[x][y] = piece
+
+    def listMoves(self, pawnType: type) -> list:
+        """Returns every legal move for pawns of the given type, as move strings such as "A3>A2"."""
+        moves = []
+        for row in self.board:
+            for space in row:
+                if type(space) is pawnType:
+                    for target in space.getMoves(self):
+                        moves.append(outputCoords(space.posX, space.posY)+">"+outputCoords(target[0], target[1]))
+        return moves
+    
     def reset(self) -> None:
-        """Reset the board to its default layout."""
-        self.board = [
-            [BlackPawn(0,0,"BP1"),BlackPawn(0,1,"BP2"),BlackPawn(0,2,"BP3")],
-            ["   ","   ","   "],
-            [WhitePawn(2,0,"WP1"),WhitePawn(2,1,"WP2"),WhitePawn(2,2,"WP3")]
-        ]
+        """Reset the board to its default layout, reusing the board's pawns."""
+        self.movesMade = 0
+        pieces = self.pieces
+        last = self.rows-1
+        for x in range(1, last):
+            for y in range(self.columns): self.board[x][y] = "   "
+        for i in range(self.columns):
+            pieces[i].changePos(0, i)
+            pieces[i+self.columns].changePos(last, i)
+            self.board[0][i] = pieces[i]
+            self.board[last][i] = pieces[i+self.columns]
+
+class GeneratedLayouts(dict):
+    """
+    A `layoutLookup` for board sizes that have no hand-made table of layouts.
+
+    The moves for a layout are generated, all equally likely, the first time the layout is looked up, so memory only grows with the layouts that are actually reached. Generated moves have a quality of 0, as their real quality isn't known.
+
+    `rows, columns` - The size of the board.
+
+    `pawnType` - The type of pawn the moves are for.
+
+    `layouts` - Layouts that are already known, such as ones loaded from a file.
+
+    `moveCoords` - When set, the board indexes of each generated layout's moves are added to it, like `ComputerPlayer.validateLayouts()` does, so they can be played without being checked.
+    """
+    def __init__(self, rows: int, columns: int, pawnType: type, layouts: dict = None) -> None:
+        super().__init__({} if layouts == None else layouts)
+        self.board = hexBoard(rows, columns)
+        self.pawnType = pawnType
+        self.moveCoords = None
+
+    def __missing__(self, layout: str) -> list:
+        self.board.loadCaptureString(layout)
+        moves = self.board.listMoves(self.pawnType)
+        if len(moves) == 0: raise KeyError(layout)
+        generated = [[move, 1/len(moves), 0] for move in moves]
+        self[layout] = generated
+        if self.moveCoords != None: self.moveCoords[layout] = [returnCoords(source)+returnCoords(target) for source, target in (move.split(">") for move in moves)]
+        return generated
+
+    def get(self, layout: str, default = None):
+        """Like `dict.get()`, but generates the layout's moves if it hasn't been looked up yet."""
+        try: return self[layout]
+        except KeyError: return default
 
 class ComputerPlayer():
     """
@@ -198,10 +349,24 @@ class ComputerPlayer():
     `learnFactor` - The rate at which the AI will learn. The higher, the faster.
 
     `fileSource` - When passed as a string, will overwrite the AI using a ".hexai" file source.
+
+    `batchSize` - The number of games to count moves over before applying one combined learning update. 1 learns after every game.
+
+    `rows, columns` - The size of board the AI plays on. Boards other than 3-by-3 use `GeneratedLayouts`, and a ".hexai" file source sets the size it was saved with.
+
+    Every move in `layoutLookup` is checked once when the AI is created, imported or reset, and is then played without checking it again. Set `strictMoves` to check every move as it is played. If `layoutLookup` is replaced directly, perform `validateLayouts()` again.
     """
-    def __init__(self, learnFactor: float = 0.01, fileSource: str = None) -> None:
+    pawnType = BlackPawn
+
+    def __init__(self, learnFactor: float = 0.01, fileSource: str = None, batchSize: int = 1, rows: int = 3, columns: int = 3) -> None:
         self.learnFactor = learnFactor
+        self.rows = rows
+        self.columns = columns
         self.moveArchive = []
+        self.batchSize = batchSize
+        self.batchCounts = {}
+        self.batchGames = 0
+        self.updateCount = 0
         self.layoutLookup = {
             # Turn 2 Layouts
             "bbbowowow": [["A1>A2",1/2,-1], ["A1>B2",1/2,1]], # Image: 2
@@ -244,19 +409,65 @@ class ComputerPlayer():
         self.winCount = 0
         self.benchmarkScore = 0
         self.benchmarkArchive = []
-        if fileSource != None:
-            with open(fileSource, 'r') as file:
-                fileData = loads(file.read())
-            self.layoutLookup = fileData["AI_Data"]
-            self.gameCount = fileData["games"]
-            self.winCount = fileData["wins"]
-            self.benchmarkScore = fileData["benchmark"]
-            self.benchmarkArchive = fileData["benchmark_history"]
+        self.summaryCache = None
+        if rows != 3 or columns != 3: self.layoutLookup = {}
+        self.strictMoves = False
+        if fileSource != None: self.useModelData(readModelFile(fileSource))
+        else: self.useLayouts(self.layoutLookup)
+
+    def validateLayouts(self, layouts: dict = None, rows: int = None, columns: int = None) -> dict:
+        """
+        Checks that every move in `layoutLookup` is legal on its layout, and stores the board indexes of each move so it can be played without checking it again.
+
+        `layouts, rows, columns` - A table and board size to check instead. Their board indexes are returned without being stored.
+
+        Raises a `RuntimeError` for an illegal move.
+        """
+        if rows == None: rows, columns = (self.rows, self.columns)
+        board = hexBoard(rows, columns)
+        moveCoords = {}
+        for layout, moves in (self.layoutLookup if layouts == None else layouts).items():
+            board.loadCaptureString(layout)
+            legalMoves = board.listMoves(self.pawnType)
+            coords = []
+            for move in moves:
+                if not move[0] in legalMoves: raise RuntimeError(f"AI has move {move[0]} on board layout {layout}, which is an illegal move.")
+                source, target = move[0].split(">")
+                coords.append(returnCoords(source)+returnCoords(target))
+            moveCoords[layout] = coords
+        if layouts == None: self.moveCoords = moveCoords
+        return moveCoords
+
+    def useLayouts(self, layouts: dict, rows: int = None, columns: int = None) -> None:
+        """
+        Replaces `layoutLookup`, and the board size if `rows, columns` are given, once every move has passed `validateLayouts()`. Nothing is changed if a move is illegal.
+
+        On boards other than 3-by-3, any layouts missing from `layouts` are generated when they are first needed.
+        """
+        if rows == None: rows, columns = (self.rows, self.columns)
+        if rows != 3 or columns != 3: layouts = GeneratedLayouts(rows, columns, self.pawnType, layouts)
+        moveCoords = self.validateLayouts(layouts, rows, columns)
+        if type(layouts) is GeneratedLayouts: layouts.moveCoords = moveCoords
+        self.rows, self.columns = (rows, columns)
+        self.layoutLookup = layouts
+        self.moveCoords = moveCoords
+
+    def applyMove(self, boardString: str, moveData: tuple, board: hexBoard) -> None:
+        """Performs a move selected by `pickMove()` on a board with the layout `boardString`. The move is only checked if `strictMoves` is set. Either way, it is made with `hexBoard.makeMove()`, so it can be undone."""
+        coords = None if self.strictMoves else self.moveCoords.get(boardString)
+        if coords == None:
+            if self.pawnType is WhitePawn: handleMasterAIMove(moveData, board)
+            else: handleAIMove(moveData, board)
+        else: board.makeMove(*coords[moveData[3]])
 
     def archiveMove(self, boardString: str, moveIndex: int) -> None:
         """Add a move and its board layout to the AI's move archive. this is used for learning."""
         self.moveArchive.append((boardString, moveIndex))
     
+    def policyMatrix(self, seed: int = None):
+        """Returns a `PolicyMatrix` copy of this AI's move probabilities, for picking moves for many layouts at once."""
+        return PolicyMatrix(self, seed)
+
     def pickMove(self, boardString: str) -> tuple:
         """Select a move given the string layout of the board."""
         moves = self.layoutLookup[boardString]
@@ -295,45 +506,143 @@ class ComputerPlayer():
                 if self.layoutLookup[boardString][self.layoutLookup[boardString].index(move)][1] > 1: self.layoutLookup[boardString][self.layoutLookup[boardString].index(move)][1] = 1
                 if self.layoutLookup[boardString][self.layoutLookup[boardString].index(move)][1] < 0: self.layoutLookup[boardString][self.layoutLookup[boardString].index(move)][1] = 0
     
-    def learnFromGame(self, AIWin: bool) -> None:
-        """Take all moves from the move archive, and apply learning modifications."""
-        for move in self.moveArchive:
-            self.modifyMoveProbability(move[0], move[1], AIWin)
+    def learnFromGame(self, AIWin: bool) -> bool:
+        """
+        Take all moves from the move archive, and apply learning modifications.
+
+        If `batchSize` is above 1, the moves are only counted until `batchSize` games have been played, then `applyBatch()` is performed.
+
+        Returns whether the move probabilities were changed.
+        """
+        self.updateCount += len(self.moveArchive)
+        if self.batchSize <= 1:
+            for move in self.moveArchive:
+                self.modifyMoveProbability(move[0], move[1], AIWin)
+            self.moveArchive = []
+            return True
+        outcome = 1 if AIWin else -1
+        for boardString, moveIndex in self.moveArchive:
+            counts = self.batchCounts.get(boardString)
+            if counts is None:
+                counts = [0]*len(self.layoutLookup[boardString])
+                self.batchCounts[boardString] = counts
+            counts[moveIndex] += outcome
         self.moveArchive = []
+        self.batchGames += 1
+        if self.batchGames >= self.batchSize: return self.applyBatch()
+        return False
+
+    def applyBatch(self) -> bool:
+        """
+        Apply the moves counted in the current batch, making one combined probability update per layout.
+
+        Each count is the number of won games minus the number of lost games the move was played in, so the update matches the sum of the per-game updates.
+
+        Returns whether there was a batch to apply.
+        """
+        if self.batchGames == 0: return False
+        for boardString, counts in self.batchCounts.items():
+            moves = self.layoutLookup[boardString]
+            size = len(moves)
+            if size == 1: continue
+            total = sum(counts)
+            for i in range(size):
+                probability = moves[i][1] + self.learnFactor*(counts[i] - (total-counts[i])/(size-1))
+                if probability > 1: probability = 1
+                if probability < 0: probability = 0
+                moves[i][1] = probability
+        self.batchCounts = {}
+        self.batchGames = 0
+        return True
     
     def flushArchive(self) -> None:
         """Empty the move archive"""
         self.moveArchive = []
     
-    def exportAI(self, filename: str = 'output.hexai') -> None:
-        """Save an AI with a given filename in ".hexai" format by default"""
+    def exportAI(self, filename: str = 'output.hexai', base: str = None, extraData: dict = None) -> None:
+        """
+        Save an AI with a given filename in ".hexai" format by default
+
+        `base` - When given, only the layouts that differ from a base AI are saved. Use "default" for a new AI's layouts, or the path of another ".hexai" file. That file must not change or move relative to this one, or this AI can't be loaded.
+
+        `extraData` - More fields to save in the file, such as those of a subclass.
+
+        The file starts with a short summary of the AI, so `summariseModel()` can read it without reading the whole file.
+        """
+        history = self.benchmarkArchive
         output = {
+            "summary": {
+                "games": self.gameCount,
+                "wins": self.winCount,
+                "benchmark": self.benchmarkScore,
+                "peak": max(history) if len(history) > 0 else self.benchmarkScore,
+                "average": sum(history)/len(history) if len(history) > 0 else self.benchmarkScore,
+                "board_size": [self.rows, self.columns]
+            },
             "games": self.gameCount,
             "wins": self.winCount,
             "benchmark": self.benchmarkScore,
-            "benchmark_history": self.benchmarkArchive,
-            "AI_Data": self.layoutLookup
+            "benchmark_history": self.benchmarkArchive
         }
+        if base == None: output["AI_Data"] = self.layoutLookup
+        else:
+            if base == "default":
+                baseLayouts = ComputerPlayer(rows=self.rows, columns=self.columns).layoutLookup
+                output["base"] = "default"
+            else:
+                baseData = readModelFile(base)
+                if list(baseData.get("board_size", (3, 3))) != [self.rows, self.columns]: raise ValueError(f"Base model {base} is for a different board size.")
+                baseLayouts = baseData["AI_Data"]
+                output["base"] = {"file": path.relpath(base, path.dirname(path.abspath(filename))), "sha256": hashModel(base)}
+            output["AI_Diff"] = diffLayouts(self.layoutLookup, baseLayouts)
+        if self.rows != 3 or self.columns != 3: output["board_size"] = [self.rows, self.columns]
+        if extraData != None: output.update(extraData)
         with open(filename,"w") as file:
             finalOutput = dumps(output)
             file.write(finalOutput)
     
     def importAI(self, fileSource: str) -> None:
-        """Load an AI from a file source. All data is overwritten."""
-        with open(fileSource, 'r') as file:
-            fileData = loads(file.read())
-        self.layoutLookup = fileData["AI_Data"]
-        self.gameCount = fileData["games"]
-        self.winCount = fileData["wins"]
-        self.benchmarkScore = fileData["benchmark"]
-        self.benchmarkArchive = fileData["benchmark_history"]
+        """Load an AI from a file source. All data is overwritten. If the file can't be read or has an illegal move, the AI is left unchanged."""
+        self.useModelData(readModelFile(fileSource))
+
+    def useModelData(self, fileData: dict) -> None:
+        """Load an AI from the data read from a ".hexai" file by `readModelFile()`. All data is overwritten, unless the data is incomplete or has an illegal move."""
+        games, wins, score, history = (fileData["games"], fileData["wins"], fileData["benchmark"], fileData["benchmark_history"])
+        self.useLayouts(fileData["AI_Data"], *fileData.get("board_size", (3, 3)))
+        self.batchCounts = {}
+        self.batchGames = 0
+        self.gameCount = games
+        self.winCount = wins
+        self.benchmarkScore = score
+        self.benchmarkArchive = history
+        self.summaryCache = None
     
+    def resumeData(self) -> dict:
+        """Returns everything needed to rebuild this AI exactly, including learning in progress. Used by `saveResumeFile()`."""
+        return {
+            "player": type(self).__name__,
+            "settings": {},
+            "games": self.gameCount,
+            "wins": self.winCount,
+            "benchmark": self.benchmarkScore,
+            "benchmark_history": self.benchmarkArchive,
+            "AI_Data": self.layoutLookup,
+            "board_size": [self.rows, self.columns],
+            "learn_factor": self.learnFactor,
+            "batch_size": self.batchSize,
+            "batch_counts": self.batchCounts,
+            "batch_games": self.batchGames,
+            "update_count": self.updateCount,
+            "strict_moves": self.strictMoves
+        }
+
     def benchmark(self) -> int:
         """Produce a score that can be used to compare the skill level of different AIs"""
         score = 0.0
-        for moves in self.layoutLookup.values():
-            for move in moves:
-                score += move[1]*move[2]
+        if not isinstance(self.layoutLookup, GeneratedLayouts): # Generated moves all have a quality of 0
+            for moves in self.layoutLookup.values():
+                for move in moves:
+                    score += move[1]*move[2]
         finalScore = int(score*1000)
         if finalScore == 333:
             finalScore = 0
@@ -367,21 +676,42 @@ class ComputerPlayer():
         plt.bar([name], self.benchmarkScore, label=name)
         if display: plt.show()
     
-    def plotBenchmarkHistory(self, display: bool = True, name: str = "AI Record") -> None:
+    def plotBenchmarkHistory(self, display: bool = True, name: str = "AI Record", resolution: int = 2000) -> None:
         """
         Use Matplotlib.pyplot and Numpy to display benchmark score over time.
 
         `display` - Defines whether `plt.show()` will execute.
 
         `name` - Set a custom label
+
+        `resolution` - Histories longer than this are drawn as the lowest and highest score in each of this many sections.
         """
-        archSize = len(self.benchmarkArchive)
-        x = np.linspace(1,archSize,archSize)
-        y = np.array(self.benchmarkArchive)
-        plt.plot(x,y, label=name)
-        print(f"Current Score: {self.benchmarkScore}\nPeak Score: {max(self.benchmarkArchive)}\nAverage Score: {np.average(self.benchmarkArchive)}\nBenchmark calculated {archSize} total times.")
+        archSize, peak, average = self.benchmarkSummary()
+        x, low, high = decimateSeries(self.benchmarkArchive, resolution)
+        if len(x) == archSize: plt.plot(x, high, label=name)
+        else: plt.fill_between(x, low, high, label=name, alpha=0.6, linewidth=1)
+        print(f"Current Score: {self.benchmarkScore}\nPeak Score: {peak}\nAverage Score: {average}\nBenchmark calculated {archSize} total times.")
         plt.legend()
         if display: plt.show()
+
+    def benchmarkSummary(self) -> tuple:
+        """
+        Returns the length, peak and average of the benchmark history.
+
+        The totals are cached and only the scores added since the last call are read, unless the history has been replaced.
+        """
+        archive = self.benchmarkArchive
+        cache = self.summaryCache
+        if cache == None or cache[0] is not archive or cache[1] > len(archive): cache = [archive, 0, None, 0]
+        if cache[1] < len(archive):
+            newScores = archive[cache[1]:]
+            newPeak = max(newScores)
+            cache[2] = newPeak if cache[2] == None else max(cache[2], newPeak)
+            cache[3] += sum(newScores)
+            cache[1] = len(archive)
+        self.summaryCache = cache
+        average = cache[3]/cache[1] if cache[1] > 0 else 0
+        return (cache[1], cache[2], average)
     
     def plotWinsOverGames(self, display: bool = True, name: str = "AI Record") -> None:
         """
@@ -404,6 +734,10 @@ class ComputerPlayer():
         """Reset all values to default settings."""
         self.learnFactor = 0.01
         self.moveArchive = []
+        self.batchSize = 1
+        self.batchCounts = {}
+        self.batchGames = 0
+        self.updateCount = 0
         self.layoutLookup = {
             # Turn 2 Layouts
             "bbbowowow": [["A1>A2",1/2,-1], ["A1>B2",1/2,1]], # Image: 2
@@ -446,14 +780,23 @@ class ComputerPlayer():
         self.winCount = 0
         self.benchmarkScore = 0
         self.benchmarkArchive = []
+        self.summaryCache = None
+        if self.rows != 3 or self.columns != 3: self.layoutLookup = {}
+        self.useLayouts(self.layoutLookup)
     
 class MasterPlayer(ComputerPlayer):
     """
     AI Player that acts as a replacement to a Human Player
 
     Used by training and testing functions to develop AI. Is currently replacable with a Random move function.
+
+    `rows, columns` - The size of board to play on. On boards other than 3-by-3, every move is equally likely.
     """
-    def __init__(self) -> None:
+    pawnType = WhitePawn
+
+    def __init__(self, rows: int = 3, columns: int = 3) -> None:
+        self.rows = rows
+        self.columns = columns
         self.layoutLookup = {
             # Turn 1 Layout (Starting Move)
             "bbbooowww": [["A3>A2",1/3],["B3>B2",1/3],["C3>C2",1/3]],
@@ -492,35 +835,921 @@ class MasterPlayer(ComputerPlayer):
             "ooobwbooo": [["B2>B1",1.0]],
             "ooowbwooo": [["A2>A1",1/2],["C2>C1",1/2]]
         }
+        if rows != 3 or columns != 3: self.layoutLookup = {}
+        self.strictMoves = False
+        self.useLayouts(self.layoutLookup)
 
 
-def checkEndGame(board: hexBoard) -> bool:
-    """Analyses a board and returns whether the board has reached an endgame state."""
-    opponentPieces = []
-    playerPieces = []
-    for space in board.board[0]:
-        if type(space) is WhitePawn:
+class BeadPlayer(ComputerPlayer):
+    """
+    An AI that learns like MENACE, by keeping a whole number of beads for each move instead of adjusting probabilities.
+
+    `initialBeads` - The beads each move starts with. A layout whose moves run out of beads is refilled with this many for each move.
+
+    `reward` - Beads added to each move played in a won game.
+
+    `punishment` - Beads taken from each move played in a lost game.
+
+    Moves are picked from a running total of the bead counts, so the counts never drift. The probabilities in `layoutLookup` are kept equal to each move's share of its layout's beads, so it can be saved, benchmarked and tested like a `ComputerPlayer`. Saved files also keep the bead counts, and loading a file without them turns its probabilities into beads. `learnFactor` and `batchSize` have no effect.
+    """
+    def __init__(self, initialBeads: int = 4, reward: int = 3, punishment: int = 1, fileSource: str = None, rows: int = 3, columns: int = 3) -> None:
+        self.initialBeads = initialBeads
+        self.reward = reward
+        self.punishment = punishment
+        super().__init__(fileSource=fileSource, rows=rows, columns=columns)
+
+    def useLayouts(self, layouts: dict, rows: int = None, columns: int = None) -> None:
+        """Replaces `layoutLookup` like `ComputerPlayer.useLayouts()` and turns each move's probability into beads."""
+        super().useLayouts(layouts, rows, columns)
+        self.beads = {}
+        self.totals = {}
+        for layout in self.layoutLookup: self.__addLayout(layout)
+
+    def exportAI(self, filename: str = 'output.hexai', base: str = None) -> None:
+        """Save an AI like `ComputerPlayer.exportAI()`, along with its bead counts."""
+        super().exportAI(filename, base, {"beads": self.beads})
+
+    def resumeData(self) -> dict:
+        """Returns everything needed to rebuild this AI exactly, like `ComputerPlayer.resumeData()`, along with its bead settings and counts."""
+        data = super().resumeData()
+        data["settings"] = {"initialBeads": self.initialBeads, "reward": self.reward, "punishment": self.punishment}
+        data["beads"] = self.beads
+        return data
+
+    def useModelData(self, fileData: dict) -> None:
+        """Load an AI like `ComputerPlayer.useModelData()`. Bead counts are restored if the data has them, otherwise they're made from the probabilities."""
+        super().useModelData(fileData)
+        for layout, counts in fileData.get("beads", {}).items():
+            if layout in self.beads and len(counts) == len(self.beads[layout]):
+                self.beads[layout] = counts
+                self.__refresh(layout)
+
+    def __addLayout(self, layout: str) -> list:
+        moves = self.layoutLookup[layout]
+        self.beads[layout] = [max(round(move[1]*self.initialBeads*len(moves)), 0) for move in moves]
+        return self.__refresh(layout)
+
+    def __refresh(self, layout: str) -> list:
+        """Rebuild a layout's running totals and probabilities after its beads change."""
+        counts = self.beads[layout]
+        total = sum(counts)
+        if total == 0:
+            counts[:] = [self.initialBeads]*len(counts)
+            total = self.initialBeads*len(counts)
+        totals = list(accumulate(counts))
+        self.totals[layout] = totals
+        moves = self.layoutLookup[layout]
+        for i in range(len(moves)): moves[i][1] = counts[i]/total
+        return totals
+
+    def pickMove(self, boardString: str) -> tuple:
+        """Select a move given the string layout of the board, by drawing a bead."""
+        totals = self.totals.get(boardString)
+        if totals == None: totals = self.__addLayout(boardString)
+        moves = self.layoutLookup[boardString]
+        index = 0 if len(totals) == 1 else bisect_right(totals, int(random()*totals[-1]))
+        output = moves[index][0].split(">")
+        return (output[0], output[1], moves[index][1], index)
+
+    def modifyMoveProbability(self, boardString: str, moveIndex: int, AIWin: bool, overrideFactor: float = None) -> None:
+        """Add beads to a move if the AI won, or take them away if it lost. `overrideFactor` has no effect."""
+        counts = self.beads[boardString]
+        if len(counts) == 1: return
+        counts[moveIndex] = max(counts[moveIndex] + (self.reward if AIWin else -self.punishment), 0)
+        self.__refresh(boardString)
+
+    def learnFromGame(self, AIWin: bool) -> bool:
+        """Take all moves from the move archive and add or take away their beads. Always returns `True`."""
+        self.updateCount += len(self.moveArchive)
+        change = self.reward if AIWin else -self.punishment
+        changed = set()
+        for boardString, moveIndex in self.moveArchive:
+            counts = self.beads[boardString]
+            if len(counts) == 1: continue
+            counts[moveIndex] = max(counts[moveIndex] + change, 0)
+            changed.add(boardString)
+        for boardString in changed: self.__refresh(boardString)
+        self.moveArchive = []
+        return True
+
+    def applyBatch(self) -> bool:
+        """Beads are always added straight away, so there is never a batch to apply."""
+        return False
+
+class PolicyMatrix():
+    """
+    A NumPy matrix form of an AI's move probabilities, for picking and learning from many moves in one call. Requires numpy.
+
+    `ai` - The AI to copy the probabilities from.
+
+    `seed` - Seed for the matrix's own random number generator.
+
+    Each layout is a row (see `rows`), and each move a column, padded to the layout with the most moves. `valid` marks the real moves, `quality` holds each move's quality value and `probabilities` holds 0 for padding. Use `applyTo()` to copy the probabilities back to an AI.
+    """
+    def __init__(self, ai: ComputerPlayer, seed: int = None) -> None:
+        if not chartsAvailable: raise ModuleNotFoundError("PolicyMatrix requires numpy to be installed.")
+        self.layouts = list(ai.layoutLookup)
+        self.rows = {layout: i for i, layout in enumerate(self.layouts)}
+        self.moves = [[move[0] for move in ai.layoutLookup[layout]] for layout in self.layouts]
+        width = max(len(moves) for moves in self.moves)
+        self.probabilities = np.zeros((len(self.layouts), width))
+        self.quality = np.zeros((len(self.layouts), width), dtype=np.int8)
+        self.valid = np.zeros((len(self.layouts), width), dtype=bool)
+        for i, layout in enumerate(self.layouts):
+            for j, move in enumerate(ai.layoutLookup[layout]):
+                self.probabilities[i, j] = move[1]
+                self.quality[i, j] = move[2]
+                self.valid[i, j] = True
+        self.moveCounts = self.valid.sum(axis=1)
+        self.learnFactor = ai.learnFactor
+        self.generator = np.random.default_rng(seed)
+
+    def rowsOf(self, states) -> "np.ndarray":
+        """Converts a list of layout strings to row numbers. Arrays of row numbers are returned unchanged."""
+        if isinstance(states, np.ndarray) and states.dtype.kind in "iu": return states
+        return np.fromiter((self.rows[state] for state in states), dtype=np.int64, count=len(states))
+
+    def pickMoves(self, states) -> "np.ndarray":
+        """
+        Select a move for every layout in `states` at once, in the same way as `ComputerPlayer.pickMove()`.
+
+        Returns an array of move indexes. If a layout's probabilities add up to less than the random value, its last move is picked instead of raising an error.
+        """
+        rows = self.rowsOf(states)
+        cumulative = np.cumsum(self.probabilities[rows], axis=1)
+        selection = self.generator.random(len(rows))
+        columns = (cumulative <= selection[:, None]).sum(axis=1)
+        counts = self.moveCounts[rows]
+        columns = np.minimum(columns, counts-1)
+        columns[counts == 1] = 0
+        return columns
+
+    def moveStrings(self, states, columns: "np.ndarray") -> list:
+        """Returns the move strings, such as "A1>A2", for the given layouts and move indexes."""
+        return [self.moves[row][column] for row, column in zip(self.rowsOf(states), columns)]
+
+    def learnFromMoves(self, states, columns: "np.ndarray", AIWins: "np.ndarray") -> None:
+        """
+        Apply learning for many moves at once, as one combined update per layout.
+
+        `AIWins` - Whether the AI won the game each move was played in.
+
+        The result matches `ComputerPlayer.applyBatch()` for the same moves.
+        """
+        rows = self.rowsOf(states)
+        counts = np.zeros(self.probabilities.shape)
+        np.add.at(counts, (rows, np.asarray(columns)), np.where(AIWins, 1.0, -1.0))
+        others = np.maximum(self.moveCounts-1, 1)[:, None]
+        change = self.learnFactor*(counts - (counts.sum(axis=1)[:, None] - counts)/others)
+        change[(self.moveCounts == 1) | ~counts.any(axis=1)] = 0
+        np.clip(self.probabilities + change, 0, 1, out=self.probabilities)
+        self.probabilities[~self.valid] = 0
+
+    def applyTo(self, ai: ComputerPlayer) -> None:
+        """Copy the probabilities back into an AI with the same layouts."""
+        for i, layout in enumerate(self.layouts):
+            moves = ai.layoutLookup[layout]
+            for j in range(len(moves)):
+                moves[j][1] = float(self.probabilities[i, j])
+
+class ConvergenceMonitor():
+    """
+    Watches a training run from `virtualiseGames()` and decides when it can stop early.
+
+    `checkInterval` - The number of games between each check.
+
+    `window` - The number of checks the benchmark score is compared across.
+
+    `tolerance` - The run has plateaued once the benchmark score has moved by no more than this across the window. `None` disables this check.
+
+    `maxChange` - The run has plateaued once no move probability has changed by more than this since the last check. `None` disables this check.
+
+    `targetScore` - Stop as soon as the benchmark score reaches this value. `None` disables this check.
+
+    When both plateau checks are enabled, both must be met. After a run, `gamesPlayed` holds the number of games actually played and `reason` holds why the run stopped early, or `None`.
+    """
+    def __init__(self, checkInterval: int = 100, window: int = 10, tolerance: int = 0, maxChange: float = None, targetScore: int = None) -> None:
+        if checkInterval <= 0: raise ValueError("Argument checkInterval must be a positive integer above 0.")
+        self.checkInterval = checkInterval
+        self.window = window
+        self.tolerance = tolerance
+        self.maxChange = maxChange
+        self.targetScore = targetScore
+        self.begin()
+
+    def begin(self, ai: ComputerPlayer = None) -> None:
+        """Clear the history of a previous run. Performed by `virtualiseGames()` before the first game."""
+        self.scores = deque(maxlen=self.window)
+        self.snapshot = None if ai == None else self.__probabilities(ai)
+        self.largestChange = None
+        self.gamesPlayed = 0
+        self.reason = None
+
+    def __probabilities(self, ai: ComputerPlayer) -> list:
+        return [move[1] for moves in ai.layoutLookup.values() for move in moves]
+
+    def saveState(self) -> dict:
+        """Returns the monitor's settings and progress, so a paused run can carry on with it. See `monitorFromState()`."""
+        return {
+            "type": "ConvergenceMonitor",
+            "settings": {"checkInterval": self.checkInterval, "window": self.window, "tolerance": self.tolerance, "maxChange": self.maxChange, "targetScore": self.targetScore},
+            "progress": {"scores": list(self.scores), "snapshot": self.snapshot, "largestChange": self.largestChange, "gamesPlayed": self.gamesPlayed, "reason": self.reason}
+        }
+
+    def loadState(self, progress: dict) -> None:
+        """Carry on from the progress saved by `saveState()`. Performed by `virtualiseGames()` instead of `begin()` when a run is resumed."""
+        self.scores = deque(progress["scores"], maxlen=self.window)
+        self.snapshot = progress["snapshot"]
+        self.largestChange = progress["largestChange"]
+        self.gamesPlayed = progress["gamesPlayed"]
+        self.reason = progress["reason"]
+
+    def check(self, ai: ComputerPlayer, gamesPlayed: int) -> bool:
+        """Record the number of games played so far, and on every `checkInterval` games, return whether training should stop."""
+        self.gamesPlayed = gamesPlayed
+        if gamesPlayed % self.checkInterval != 0: return False
+        if self.targetScore != None and ai.benchmarkScore >= self.targetScore:
+            self.reason = f"Benchmark score reached {self.targetScore}"
             return True
-        if type(space) is BlackPawn:
-            opponentPieces.append(space)
-    for space in board.board[1]:
-        if type(space) is BlackPawn:
-            opponentPieces.append(space)
-        if type(space) is WhitePawn:
-            playerPieces.append(space)
-    for space in board.board[2]:
-        if type(space) is BlackPawn:
+        plateau = True
+        if self.tolerance != None:
+            self.scores.append(ai.benchmarkScore)
+            if len(self.scores) < self.window or max(self.scores) - min(self.scores) > self.tolerance: plateau = False
+        if self.maxChange != None:
+            probabilities = self.__probabilities(ai)
+            if self.snapshot == None or len(self.snapshot) != len(probabilities): plateau = False
+            else:
+                self.largestChange = max(abs(new - old) for new, old in zip(probabilities, self.snapshot))
+                if self.largestChange > self.maxChange: plateau = False
+            self.snapshot = probabilities
+        if self.tolerance == None and self.maxChange == None: plateau = False
+        if plateau: self.reason = "Training plateaued"
+        return plateau
+
+class SequentialTest():
+    """
+    Watches a testing run from `virtualiseGames()`, with `train` off, and stops it as soon as the AI's win rate is settled. Pass it as the run's `monitor`.
+
+    `width` - Stop once the confidence interval of the win rate is no wider than this, such as 0.02 for plus or minus 1 %. `None` disables this check.
+
+    `threshold` - Stop once a sequential probability ratio test decides whether the win rate is above or below this. `None` disables this check.
+
+    `margin` - Win rates within this of `threshold` are too close to call, and the test decides between `threshold - margin` and `threshold + margin`.
+
+    `confidence` - The confidence level of the interval.
+
+    `alpha, beta` - The chances of wrongly deciding the win rate is above, or below, the threshold.
+
+    `minGames` - The number of games played before either check.
+
+    After a run, `gamesPlayed`, `wins`, `winRate` and `interval` describe the games played, `decision` is "above", "below" or `None`, and `reason` holds why the run stopped early, or `None`.
+    """
+    def __init__(self, width: float = None, threshold: float = None, margin: float = 0.02, confidence: float = 0.95, alpha: float = 0.05, beta: float = 0.05, minGames: int = 100) -> None:
+        if width == None and threshold == None: raise ValueError("Argument width or threshold must be given.")
+        if threshold != None and (threshold - margin <= 0 or threshold + margin >= 1): raise ValueError("Arguments threshold and margin must keep the compared win rates between 0 and 1.")
+        self.width = width
+        self.threshold = threshold
+        self.margin = margin
+        self.confidence = confidence
+        self.alpha = alpha
+        self.beta = beta
+        self.z = NormalDist().inv_cdf(0.5 + confidence/2)
+        self.minGames = minGames
+        if threshold != None:
+            low, high = (threshold - margin, threshold + margin)
+            self.winWeight = log(high/low)
+            self.lossWeight = log((1-high)/(1-low))
+            self.upperBound = log((1-beta)/alpha)
+            self.lowerBound = log(beta/(1-alpha))
+        self.begin()
+
+    def begin(self, ai: ComputerPlayer = None) -> None:
+        """Clear the results of a previous run. Performed by `virtualiseGames()` before the first game."""
+        self.startGames = 0 if ai == None else ai.gameCount
+        self.startWins = 0 if ai == None else ai.winCount
+        self.gamesPlayed = 0
+        self.wins = 0
+        self.winRate = 0.0
+        self.interval = (0.0, 1.0)
+        self.decision = None
+        self.reason = None
+
+    def saveState(self) -> dict:
+        """Returns the test's settings and progress, so a paused run can carry on with it. See `monitorFromState()`."""
+        return {
+            "type": "SequentialTest",
+            "settings": {"width": self.width, "threshold": self.threshold, "margin": self.margin, "confidence": self.confidence, "alpha": self.alpha, "beta": self.beta, "minGames": self.minGames},
+            "progress": {"startGames": self.startGames, "startWins": self.startWins, "gamesPlayed": self.gamesPlayed, "wins": self.wins, "winRate": self.winRate, "interval": list(self.interval), "decision": self.decision, "reason": self.reason}
+        }
+
+    def loadState(self, progress: dict) -> None:
+        """Carry on from the progress saved by `saveState()`. Performed by `virtualiseGames()` instead of `begin()` when a run is resumed."""
+        self.startGames = progress["startGames"]
+        self.startWins = progress["startWins"]
+        self.gamesPlayed = progress["gamesPlayed"]
+        self.wins = progress["wins"]
+        self.winRate = progress["winRate"]
+        self.interval = tuple(progress["interval"])
+        self.decision = progress["decision"]
+        self.reason = progress["reason"]
+
+    def check(self, ai: ComputerPlayer, gamesPlayed: int) -> bool:
+        """Record the results so far, and return whether testing can stop."""
+        self.gamesPlayed = gamesPlayed
+        games = ai.gameCount - self.startGames
+        self.wins = ai.winCount - self.startWins
+        if games <= 0: return False
+        self.winRate = self.wins/games
+        # Wilson score interval
+        z = self.z
+        centre = (self.winRate + z*z/(2*games))/(1 + z*z/games)
+        spread = z*sqrt(self.winRate*(1-self.winRate)/games + z*z/(4*games*games))/(1 + z*z/games)
+        self.interval = (max(centre - spread, 0.0), min(centre + spread, 1.0))
+        if games < self.minGames: return False
+        if self.threshold != None:
+            ratio = self.wins*self.winWeight + (games - self.wins)*self.lossWeight
+            if ratio >= self.upperBound: self.decision = "above"
+            elif ratio <= self.lowerBound: self.decision = "below"
+            if self.decision != None:
+                self.reason = f"Win rate is {self.decision} {round(self.threshold*100, 2)} %"
+                return True
+        if self.width != None and self.interval[1] - self.interval[0] <= self.width:
+            self.reason = f"Win rate settled at {round(self.winRate*100, 2)} %"
             return True
-        if type(space) is WhitePawn:
-            playerPieces.append(space)
+        return False
+
+def monitorFromState(state: dict):
+    """Rebuilds a `ConvergenceMonitor` or `SequentialTest` from its `saveState()`, with its progress restored."""
+    monitorType = {"ConvergenceMonitor": ConvergenceMonitor, "SequentialTest": SequentialTest}.get(state["type"])
+    if monitorType == None: raise ValueError(f"Unknown monitor type {state['type']}.")
+    monitor = monitorType(**state["settings"])
+    monitor.loadState(state["progress"])
+    return monitor
+
+class TrainingMetrics():
+    """
+    Live statistics for a `virtualiseGames()` run, published in the Prometheus text format.
+
+    `fileName` - The file the metrics are written to. `None` disables writing.
+
+    `port` - When given, the metrics are also served at `http://127.0.0.1:<port>/metrics` from a background thread.
+
+    `window` - The number of recent games the rolling win rate is taken over.
+
+    `publishInterval` - The minimum number of seconds between updates of the published metrics.
+
+    Games are only counted while they are played. Rates and the benchmark score are worked out when the metrics are published.
+    """
+    def __init__(self, fileName: str = "hexapawn-metrics.prom", port: int = None, window: int = 1000, publishInterval: float = 1.0) -> None:
+        self.fileName = fileName
+        self.window = window
+        self.publishInterval = publishInterval
+        self.text = ""
+        self.server = None
+        self.begin()
+        if port != None: self.serve(port)
+
+    def begin(self, ai: ComputerPlayer = None, cache = None) -> None:
+        """Reset the counters for a new run. Performed by `virtualiseGames()` before the first game, with the run's `PositionCache`."""
+        self.ai = ai
+        self.cache = cache
+        self.games = 0
+        self.wins = 0
+        self.logBytes = 0
+        self.results = deque()
+        self.rollingWins = 0
+        self.updateStart = 0 if ai == None else ai.updateCount
+        self.startTime = perf_counter()
+        self.lastPublish = self.startTime
+
+    def recordGame(self, won: bool, logBytes: int = 0) -> None:
+        """Count a finished game. Every 256 games, the metrics are published if `publishInterval` has passed."""
+        self.games += 1
+        if won:
+            self.wins += 1
+            self.rollingWins += 1
+        self.results.append(won)
+        if len(self.results) > self.window:
+            if self.results.popleft(): self.rollingWins -= 1
+        self.logBytes += logBytes
+        if self.games & 255 == 0 and perf_counter() - self.lastPublish >= self.publishInterval: self.publish()
+
+    def render(self) -> str:
+        """Returns the current metrics in the Prometheus text format."""
+        elapsed = max(perf_counter() - self.startTime, 1e-9)
+        updates = 0 if self.ai == None else self.ai.updateCount - self.updateStart
+        benchmark = 0 if self.ai == None else self.ai.benchmarkScore
+        winRate = self.rollingWins/len(self.results) if len(self.results) > 0 else 0
+        metrics = [
+            ("hexapawn_games_total", "counter", "Games played in this run.", self.games),
+            ("hexapawn_wins_total", "counter", "Games won by the AI in this run.", self.wins),
+            ("hexapawn_games_per_second", "gauge", "Average games played per second.", self.games/elapsed),
+            ("hexapawn_rolling_win_rate", "gauge", f"AI win rate over the last {self.window} games.", winRate),
+            ("hexapawn_benchmark_score", "gauge", "Current benchmark score of the AI.", benchmark),
+            ("hexapawn_learning_updates_total", "counter", "Moves the AI has learned from in this run.", updates),
+            ("hexapawn_learning_updates_per_second", "gauge", "Average moves learned from per second.", updates/elapsed),
+            ("hexapawn_log_bytes_total", "counter", "Bytes of game log written in this run.", self.logBytes)
+        ]
+        if self.cache != None:
+            metrics.append(("hexapawn_position_cache_hit_rate", "gauge", "Fraction of position lookups found in the cache.", self.cache.hitRate()))
+            metrics.append(("hexapawn_position_cache_positions", "gauge", "Positions held in the position cache.", len(self.cache)))
+        lines = []
+        for name, kind, description, value in metrics:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines)+"\n"
+
+    def publish(self) -> None:
+        """Update the served metrics and rewrite the metrics file."""
+        self.lastPublish = perf_counter()
+        self.text = self.render()
+        if self.fileName != None:
+            with open(self.fileName+".tmp", "w") as file:
+                file.write(self.text)
+            replace(self.fileName+".tmp", self.fileName)
+
+    def serve(self, port: int = 9464) -> None:
+        """Serve the latest published metrics over HTTP on localhost, from a background thread."""
+        metrics = self
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = metrics.text.encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            def log_message(self, format, *args) -> None: pass
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop serving metrics over HTTP."""
+        if self.server != None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+def decimateSeries(values: list, buckets: int = 2000) -> tuple:
+    """
+    Reduces a long series to the lowest and highest value in each of `buckets` equal sections, so it can be plotted quickly without losing spikes.
+
+    Returns numpy arrays of the x positions (counting from 1), the lowest values and the highest values. Short series are returned whole, with the same array for both.
+    """
+    y = np.asarray(values)
+    size = len(y)
+    if size <= buckets*2:
+        return (np.arange(1, size+1), y, y)
+    starts = np.linspace(0, size, buckets+1).astype(np.int64)[:-1]
+    x = starts + (np.diff(np.append(starts, size)) + 1)/2
+    return (x, np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts))
+
+def plotBenchmarkHistories(players: dict, display: bool = True, resolution: int = 2000) -> None:
+    """
+    Plots the benchmark history of several AI on one chart.
+
+    `players` - A dictionary of labels and their `ComputerPlayer` objects.
+    """
+    for name, player in players.items():
+        player.plotBenchmarkHistory(False, name, resolution)
+    if display: plt.show()
+
+def summariseModel(fileSource: str) -> dict:
+    """
+    Returns the games, wins, win rate, board size and current, peak and average benchmark scores saved in a ".hexai" file, without building the AI.
+
+    Only the summary at the start of the file is read. Files saved before summaries were added are read in full.
+    """
+    with open(fileSource, 'r') as file:
+        head = file.read(4096)
+        summary = None
+        if head.startswith('{"summary": '):
+            try: summary = JSONDecoder().raw_decode(head, 12)[0]
+            except ValueError: summary = None
+        if summary == None:
+            fileData = loads(head + file.read())
+            history = fileData["benchmark_history"]
+            summary = {
+                "games": fileData["games"],
+                "wins": fileData["wins"],
+                "benchmark": fileData["benchmark"],
+                "peak": max(history) if len(history) > 0 else fileData["benchmark"],
+                "average": sum(history)/len(history) if len(history) > 0 else fileData["benchmark"],
+                "board_size": fileData.get("board_size", [3, 3])
+            }
+    games = summary["games"]
+    return {
+        "name": path.basename(fileSource),
+        "games": games,
+        "wins": summary["wins"],
+        "win_rate": summary["wins"]/games if games > 0 else 0.0,
+        "benchmark": summary["benchmark"],
+        "peak": summary["peak"],
+        "average": summary["average"],
+        "board_size": summary["board_size"]
+    }
+
+def compareModels(files: list, cacheFile: str = None, showTable: bool = True) -> list:
+    """
+    Summarises many ".hexai" files for comparing them, using `summariseModel()`.
+
+    `cacheFile` - JSON file where summaries are kept. Defaults to "model-summaries.json" next to the first file. A file is only read again if its modification time or size has changed, and then only summarised again if its content hash has changed too.
+
+    Returns a list of summaries in the same order as `files`, each with the model's `file` path. Load a model with `ComputerPlayer(fileSource=...)` only once it's needed.
+    """
+    if len(files) == 0: return []
+    if cacheFile == None: cacheFile = path.join(path.dirname(files[0]), "model-summaries.json")
+    cache = {}
+    if path.exists(cacheFile):
+        with open(cacheFile, 'r') as file:
+            cache = loads(file.read())
+    byHash = {entry["sha256"]: entry["summary"] for entry in cache.values()}
+    changed = False
+    rows = []
+    for fileSource in files:
+        key = path.abspath(fileSource)
+        info = stat(fileSource)
+        entry = cache.get(key)
+        if entry == None or entry["mtime"] != info.st_mtime_ns or entry["size"] != info.st_size:
+            contentHash = hashModel(fileSource)
+            if entry == None or entry["sha256"] != contentHash:
+                summary = byHash.get(contentHash)
+                if summary == None: summary = summariseModel(fileSource)
+                summary = dict(summary, name=path.basename(fileSource))
+                byHash[contentHash] = summary
+            else: summary = entry["summary"]
+            entry = {"mtime": info.st_mtime_ns, "size": info.st_size, "sha256": contentHash, "summary": summary}
+            cache[key] = entry
+            changed = True
+        rows.append(dict(entry["summary"], file=fileSource))
+    if changed:
+        with open(cacheFile+".tmp", "w") as file:
+            file.write(dumps(cache))
+        replace(cacheFile+".tmp", cacheFile)
+    if showTable:
+        print(f"{'Model':<24} {'Games':>8} {'Win %':>7} {'Score':>7} {'Peak':>7} {'Average':>9}")
+        for row in rows:
+            print(f"{row['name'][:24]:<24} {row['games']:>8} {round(row['win_rate']*100, 2):>7} {row['benchmark']:>7} {row['peak']:>7} {round(row['average']):>9}")
+    return rows
+
+def plotModelComparison(rows: list, display: bool = True) -> None:
+    """
+    Use Matplotlib.pyplot and Numpy to chart model summaries from `compareModels()` side by side.
+
+    Each model gets a group of bars for its current, peak and average benchmark scores, and its win rate is marked against a second axis.
+    """
+    x = np.arange(len(rows))
+    width = 0.27
+    figure, axis = plt.subplots()
+    axis.bar(x - width, [row["benchmark"] for row in rows], width, label="Score")
+    axis.bar(x, [row["peak"] for row in rows], width, label="Peak")
+    axis.bar(x + width, [row["average"] for row in rows], width, label="Average")
+    axis.set_ylabel("Benchmark Score")
+    axis.set_xticks(x)
+    axis.set_xticklabels([row["name"] for row in rows], rotation=90 if len(rows) > 8 else 0)
+    rateAxis = axis.twinx()
+    rateAxis.plot(x, [row["win_rate"]*100 for row in rows], "kD", label="Win %")
+    rateAxis.set_ylabel("Win %")
+    rateAxis.set_ylim(0, 100)
+    handles, labels = axis.get_legend_handles_labels()
+    rateHandles, rateLabels = rateAxis.get_legend_handles_labels()
+    axis.legend(handles+rateHandles, labels+rateLabels)
+    figure.tight_layout()
+    if display: plt.show()
+
+class GameLogger():
+    """
+    Writes a compact, structured log of automated games, as an alternative to the ".hexlog" text log.
+
+    `fileName` - The file to write to. It is overwritten.
+
+    `level` - How much to record: "outcomes" (one record per game), "moves" (also one record per move) or "probabilities" (moves, with the probability each move had when picked).
+
+    `compression` - `None`, "gzip", "bz2" or "lzma". The log is compressed as it is written.
+
+    `sampleEvery` - Only log every Nth game.
+
+    The log is plain text with one tab-separated record per line, after a header line starting with "#":
+
+    `G <game> <winner> <plies>` - A game, where the winner is "cpu" or "master".
+
+    `M <game> <ply> <layout> <move index> [<probability>]` - A move. Even plies are the Master Player's, odd plies are the AI's.
+    """
+    levels = ("outcomes", "moves", "probabilities")
+    openers = {None: open, "gzip": gzip.open, "bz2": bz2.open, "lzma": lzma.open}
+
+    def __init__(self, fileName: str, level: str = "moves", compression: str = None, sampleEvery: int = 1) -> None:
+        if not level in self.levels: raise ValueError(f"Argument level must be one of {', '.join(self.levels)}.")
+        if not compression in self.openers: raise ValueError("Argument compression must be None, gzip, bz2 or lzma.")
+        if sampleEvery <= 0: raise ValueError("Argument sampleEvery must be a positive integer above 0.")
+        self.fileName = fileName
+        self.level = self.levels.index(level)
+        self.sampleEvery = sampleEvery
+        self.games = 0
+        self.gameId = 0
+        self.file = self.openers[compression](fileName, "wt")
+        self.file.write(f"#hexapawn-log 1 level={level} sample={sampleEvery} started={ctime()}\n")
+
+    def startGame(self) -> bool:
+        """Count a new game and return whether it should be logged."""
+        self.games += 1
+        self.gameId = self.games
+        return self.games % self.sampleEvery == 0
+
+    def logMove(self, ply: int, layout: str, moveIndex: int, probability: float) -> None:
+        """Record a move in the current game."""
+        if self.level == 1: self.file.write(f"M\t{self.gameId}\t{ply}\t{layout}\t{moveIndex}\n")
+        elif self.level == 2: self.file.write(f"M\t{self.gameId}\t{ply}\t{layout}\t{moveIndex}\t{probability:.6g}\n")
+
+    def endGame(self, AIWin: bool, plies: int) -> None:
+        """Record the result of the current game."""
+        self.file.write(f"G\t{self.gameId}\t{'cpu' if AIWin else 'master'}\t{plies}\n")
+
+    def close(self) -> None:
+        """Finish writing the log."""
+        self.file.close()
+
+    def __enter__(self): return self
+
+    def __exit__(self, *error) -> None: self.close()
+
+logExtensions = (".hexlog", ".log", ".log.gz", ".log.bz2", ".log.xz")
+
+def openLog(fileSource: str):
+    """Opens a log for reading as text. Logs compressed with gzip, bz2 or lzma are recognised from their contents."""
+    with open(fileSource, 'rb') as file:
+        magic = file.read(6)
+    compression = None
+    if magic.startswith(b"\x1f\x8b"): compression = "gzip"
+    elif magic.startswith(b"BZh"): compression = "bz2"
+    elif magic.startswith(b"\xfd7zXZ\x00"): compression = "lzma"
+    return GameLogger.openers[compression](fileSource, "rt")
+
+def readLogRecords(fileSource: str, rows: int = 3, columns: int = 3):
+    """
+    Reads a log from `GameLogger` or a ".hexlog" file one line at a time, and yields its records as tuples:
+
+    `("M", game, ply, layout, move index)` - A move. Even plies are the Master Player's, odd plies are the AI's.
+
+    `("G", game, AI won, plies)` - The end of a game.
+
+    ".hexlog" files only name the squares each move went from and to, so their games are replayed to find each layout and move index. `rows, columns` gives the size of the board they were played on.
+
+    Raises a `ValueError` if the file isn't a log.
+    """
+    with openLog(fileSource) as file:
+        header = file.readline()
+        if header.startswith("#hexapawn-log"):
+            for line in file:
+                fields = line.rstrip("\n").split("\t")
+                if fields[0] == "M": yield ("M", int(fields[1]), int(fields[2]), fields[3], int(fields[4]))
+                elif fields[0] == "G": yield ("G", int(fields[1]), fields[2] == "cpu", int(fields[3]))
+        elif header.startswith("Automated Games Log"): yield from _replayTextLog(file, rows, columns)
+        else: raise ValueError(f"{fileSource} is not a Hexapawn log.")
+
+def _replayTextLog(lines, rows: int, columns: int):
+    """Turns the lines of a ".hexlog" file into records for `readLogRecords()`."""
+    cache = PositionCache(rows=rows, columns=columns)
+    tables = (MasterPlayer(rows, columns).layoutLookup, ComputerPlayer(rows=rows, columns=columns).layoutLookup)
+    game = 0
+    ply = 0
+    layout = cache.start
+    for line in lines:
+        if line.startswith("----- Game "):
+            game = int(line.split()[2])
+            ply = 0
+            layout = cache.start
+        elif line.startswith(("Master Player has moved", "Opponent has moved")):
+            words = line.split()
+            move = words[-3]+">"+words[-1]
+            moves = [entry[0] for entry in tables[ply % 2][layout]]
+            if not move in moves: raise ValueError(f"Move {move} in game {game} is illegal on board layout {layout}.")
+            yield ("M", game, ply, layout, moves.index(move))
+            layout = cache.lookup(layout, ply % 2 == 0)[2][move]
+            ply += 1
+        elif line.startswith(("Computer Won", "Master Player Won")): yield ("G", game, line.startswith("Computer"), ply)
+
+def _gamesFromRecords(records):
+    """Groups log records into games, yielding each game's moves as (ply, layout, move index), whether the AI won, and its length."""
+    moves = []
+    for record in records:
+        if record[0] == "M": moves.append(record[2:])
+        else:
+            yield (moves, record[2], record[3])
+            moves = []
+
+class LogSummary():
+    """
+    Counts of what happened in one or more game logs, kept in NumPy arrays. Requires numpy.
+
+    Each position is a layout and the side to move, so `layouts[i]` and `aiToMove[i]` describe position i.
+
+    `visits[i]` - How many times a move was played from position i.
+
+    `moveCounts[i, j]` - How many times move j of position i was played. Moves are numbered like in the player's layout table.
+
+    `moveWins[i, j]` - How many of those games the AI went on to win.
+
+    `lengths[n]` - How many games lasted n moves.
+
+    `games`, `wins` - The number of games, and how many the AI won.
+    """
+    def __init__(self) -> None:
+        if not chartsAvailable: raise ModuleNotFoundError("LogSummary requires numpy to be installed.")
+        self.layouts = []
+        self.aiToMove = []
+        self.rows = {}
+        self.visits = np.zeros(0, dtype=np.int64)
+        self.moveCounts = np.zeros((0, 1), dtype=np.int64)
+        self.moveWins = np.zeros((0, 1), dtype=np.int64)
+        self.lengths = np.zeros(1, dtype=np.int64)
+        self.games = 0
+        self.wins = 0
+
+    def __row(self, layout: str, aiToMove: bool) -> int:
+        row = self.rows.get((layout, aiToMove))
+        if row == None:
+            row = len(self.layouts)
+            self.rows[(layout, aiToMove)] = row
+            self.layouts.append(layout)
+            self.aiToMove.append(aiToMove)
+        return row
+
+    def __fit(self, width: int, longest: int) -> None:
+        """Grows the arrays to fit every known position, `width` moves per position and games `longest` moves long."""
+        extraRows = len(self.layouts) - len(self.visits)
+        extraColumns = max(width - self.moveCounts.shape[1], 0)
+        if extraRows > 0: self.visits = np.pad(self.visits, (0, extraRows))
+        if extraRows > 0 or extraColumns > 0:
+            self.moveCounts = np.pad(self.moveCounts, ((0, extraRows), (0, extraColumns)))
+            self.moveWins = np.pad(self.moveWins, ((0, extraRows), (0, extraColumns)))
+        if longest >= len(self.lengths): self.lengths = np.pad(self.lengths, (0, longest+1-len(self.lengths)))
+
+    def __addChunk(self, rows: list, columns: list, won: list, lengths: list, wins: int) -> None:
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = np.asarray(columns, dtype=np.int64)
+        won = np.asarray(won, dtype=bool)
+        self.__fit(int(columns.max())+1 if len(columns) > 0 else 0, max(lengths, default=0))
+        self.visits += np.bincount(rows, minlength=len(self.visits))
+        np.add.at(self.moveCounts, (rows, columns), 1)
+        np.add.at(self.moveWins, (rows[won], columns[won]), 1)
+        self.lengths += np.bincount(np.asarray(lengths, dtype=np.int64), minlength=len(self.lengths))
+        self.games += len(lengths)
+        self.wins += wins
+
+    def addRecords(self, records, chunkSize: int = 65536):
+        """
+        Adds a stream of records from `readLogRecords()`. They are counted `chunkSize` moves at a time, so only one game and one chunk are held in memory.
+
+        Returns the summary, so calls can be chained.
+        """
+        rows, columns, won, lengths, wins = ([], [], [], [], 0)
+        for moves, AIWin, plies in _gamesFromRecords(records):
+            for ply, layout, moveIndex in moves:
+                rows.append(self.__row(layout, ply % 2 == 1))
+                columns.append(moveIndex)
+                won.append(AIWin)
+            lengths.append(plies)
+            if AIWin: wins += 1
+            if len(rows) >= chunkSize or len(lengths) >= chunkSize:
+                self.__addChunk(rows, columns, won, lengths, wins)
+                rows, columns, won, lengths, wins = ([], [], [], [], 0)
+        if len(lengths) > 0: self.__addChunk(rows, columns, won, lengths, wins)
+        return self
+
+    def merge(self, other):
+        """Adds the counts from another `LogSummary`, matching positions by layout. Returns this summary."""
+        index = np.array([self.__row(layout, aiToMove) for layout, aiToMove in zip(other.layouts, other.aiToMove)], dtype=np.int64)
+        self.__fit(other.moveCounts.shape[1], len(other.lengths)-1)
+        if len(index) > 0:
+            width = other.moveCounts.shape[1]
+            self.visits[index] += other.visits
+            self.moveCounts[index, :width] += other.moveCounts
+            self.moveWins[index, :width] += other.moveWins
+        self.lengths[:len(other.lengths)] += other.lengths
+        self.games += other.games
+        self.wins += other.wins
+        return self
+
+    def moveWinRates(self) -> "np.ndarray":
+        """Returns the fraction of games the AI won after each move, with `nan` for moves that were never played."""
+        rates = np.full(self.moveCounts.shape, np.nan)
+        np.divide(self.moveWins, self.moveCounts, out=rates, where=self.moveCounts > 0)
+        return rates
+
+    def save(self, fileName: str = "log-summary.npz") -> None:
+        """Saves the summary as a compressed NumPy ".npz" file. Use `loadLogSummary()` to read it back."""
+        with open(fileName, 'wb') as file:
+            np.savez_compressed(file, layouts=np.array(self.layouts, dtype=str), aiToMove=np.array(self.aiToMove, dtype=bool), visits=self.visits, moveCounts=self.moveCounts, moveWins=self.moveWins, lengths=self.lengths, totals=np.array([self.games, self.wins], dtype=np.int64))
+
+    def plot(self, display: bool = True, top: int = 15) -> None:
+        """
+        Use Matplotlib.pyplot to chart the summary: how long games lasted, the `top` most visited positions, and how often the AI won after each of their moves.
+
+        `display` - Defines whether `plt.show()` will execute.
+        """
+        figure, (lengthAxis, visitAxis, rateAxis) = plt.subplots(1, 3, figsize=(15, 5))
+        lengthAxis.bar(np.arange(len(self.lengths)), self.lengths)
+        lengthAxis.set_xlabel("Moves")
+        lengthAxis.set_ylabel("Games")
+        lengthAxis.set_title(f"{self.games} games, AI won {round(self.wins/max(self.games, 1)*100, 2)} %")
+        order = np.argsort(self.visits)[::-1][:top]
+        names = [f"{self.layouts[row]} ({'AI' if self.aiToMove[row] else 'Master'})" for row in order]
+        visitAxis.barh(np.arange(len(order)), self.visits[order])
+        visitAxis.set_yticks(np.arange(len(order)))
+        visitAxis.set_yticklabels(names, fontsize=8)
+        visitAxis.invert_yaxis()
+        visitAxis.set_xlabel("Visits")
+        rates = self.moveWinRates()
+        for column in range(rates.shape[1]):
+            rateAxis.scatter(rates[order, column]*100, np.arange(len(order)), s=np.sqrt(self.moveCounts[order, column])*2, label=f"Move {column}")
+        rateAxis.set_yticks(np.arange(len(order)))
+        rateAxis.set_yticklabels([])
+        rateAxis.invert_yaxis()
+        rateAxis.set_xlim(-5, 105)
+        rateAxis.set_xlabel("AI Win % after move")
+        rateAxis.legend(fontsize=8)
+        figure.tight_layout()
+        if display: plt.show()
+
+def loadLogSummary(fileSource: str) -> LogSummary:
+    """Reads a summary saved by `LogSummary.save()`. Requires numpy."""
+    if not chartsAvailable: raise ModuleNotFoundError("loadLogSummary requires numpy to be installed.")
+    summary = LogSummary()
+    with np.load(fileSource) as data:
+        summary.layouts = [str(layout) for layout in data["layouts"]]
+        summary.aiToMove = [bool(aiToMove) for aiToMove in data["aiToMove"]]
+        summary.visits = data["visits"]
+        summary.moveCounts = data["moveCounts"]
+        summary.moveWins = data["moveWins"]
+        summary.lengths = data["lengths"]
+        summary.games, summary.wins = (int(total) for total in data["totals"])
+    summary.rows = {(layout, aiToMove): row for row, (layout, aiToMove) in enumerate(zip(summary.layouts, summary.aiToMove))}
+    return summary
+
+def _summariseLog(task: tuple) -> LogSummary:
+    """Summarises one log, in a worker process of `analyseLogs()`."""
+    fileSource, rows, columns = task
+    return LogSummary().addRecords(readLogRecords(fileSource, rows, columns))
+
+def analyseLogs(sources: list, processes: int = None, summaryFile: str = "log-summary.npz", rows: int = 3, columns: int = 3) -> LogSummary:
+    """
+    Streams one or more logs through a `LogSummary`, without loading any whole file.
+
+    `sources` - Log files, and directories to read every log in. Logs are recognised by their extension: ".hexlog", ".log", or ".log" followed by ".gz", ".bz2" or ".xz".
+
+    `processes` - How many processes read logs at once. `None` uses one per CPU core, and 1 reads every log in this process.
+
+    `summaryFile` - Where to save the summary. Use `None` to not save it.
+
+    `rows, columns` - The size of the board that ".hexlog" files were played on.
+
+    Returns the combined summary. Requires numpy.
+    """
+    if not chartsAvailable: raise ModuleNotFoundError("analyseLogs requires numpy to be installed.")
+    files = []
+    for source in sources:
+        if path.isdir(source): files.extend(path.join(source, name) for name in sorted(listdir(source)) if name.endswith(logExtensions))
+        else: files.append(source)
+    summary = LogSummary()
+    if processes == 1 or len(files) < 2:
+        for fileSource in files: summary.addRecords(readLogRecords(fileSource, rows, columns))
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            for part in pool.map(_summariseLog, [(fileSource, rows, columns) for fileSource in files]): summary.merge(part)
+    if summaryFile != None: summary.save(summaryFile)
+    return summary
+
+def checkEndGame(board: hexBoard, whiteToMove: bool = None) -> bool:
+    """
+    Analyses a board and returns whether the board has reached an endgame state.
+
+    `whiteToMove` - The side to move next. When given, the game is also over if that side has no legal moves, as it loses.
+    """
+    opponentPieces = []
+    playerPieces = []
+    lastRow = len(board.board)-1
+    for x, row in enumerate(board.board):
+        for space in row:
+            if type(space) is WhitePawn:
+                if x == 0: return True
+                playerPieces.append(space)
+            if type(space) is BlackPawn:
+                if x == lastRow: return True
+                opponentPieces.append(space)
     if len(opponentPieces) == 0: return True
     if len(playerPieces) == 0 : return True
-    else:
+    possibleMoves = []
+    for piece in opponentPieces:
+        possibleMoves.extend(piece.checkMoves(board))
+    if not True in possibleMoves: return True
+    if whiteToMove:
         possibleMoves = []
-        for piece in opponentPieces:
+        for piece in playerPieces:
             possibleMoves.extend(piece.checkMoves(board))
-        if True in possibleMoves: return False
-        else: return True
+        if not True in possibleMoves: return True
+    return False
 
 def returnCoords(coordString: str) -> tuple:
     """
@@ -528,10 +1757,10 @@ def returnCoords(coordString: str) -> tuple:
 
     coordString - The user-input string, such as "A3" or "C2". This is not case-sensetive.
     """
-    y = coordString[0].lower()
-    columnCheck = {"a":0, "b":1, "c":2}
-    x = int(coordString[1])-1
-    y = columnCheck[y]
+    y = coordString[0].upper()
+    if not y in columnLetters: raise KeyError(y)
+    x = int(coordString[1:])-1
+    y = columnLetters.index(y)
     return (x,y)
 
 def inputCoords() -> tuple:
@@ -543,8 +1772,7 @@ def outputCoords(x:int,y:int) -> str:
 
     x and y correspond to the indexes such that it looks like this: `dataList[x][y]`
     """
-    columnCheck = ["A","B","C"]
-    column = columnCheck[y]
+    column = columnLetters[y]
     row = str(x+1)
     return column+row
 
@@ -578,7 +1806,7 @@ def moveInput(table: hexBoard) -> bool:
                     print("Move this piece where?")
                     newCoords = inputCoords()
                     if newCoords in movesList["Moves"]:
-                        table.overwriteAndMove(coords[0],coords[1],newCoords[0],newCoords[1])
+                        table.makeMove(coords[0],coords[1],newCoords[0],newCoords[1])
                         moveFinished = True
                     else: print("Not a listed move!")
             elif type(piece) is BlackPawn: print("Not your piece.")
@@ -588,18 +1816,22 @@ def moveInput(table: hexBoard) -> bool:
         return True
     else: return False
 
-def randomMove(board: hexBoard) -> None:
-    """Placeholder Subroutine for AI"""
+def pickRandomMove(board: hexBoard, pawnType: type = BlackPawn) -> tuple:
+    """Picks a random pawn of the given type that can move, then one of its moves at random. Returns the source and target coordinates."""
     pieces = []
     moves = []
     for row in board.board:
         for space in row:
-            if type(space) is BlackPawn: pieces.append(space)
+            if type(space) is pawnType: pieces.append(space)
     while len(moves) == 0:
         selection = choice(pieces)
         moves = selection.getMoves(board)
     moveChoice = choice(moves)
-    board.overwriteAndMove(selection.posX, selection.posY, moveChoice[0], moveChoice[1])
+    return (selection.posX, selection.posY, moveChoice[0], moveChoice[1])
+
+def randomMove(board: hexBoard) -> None:
+    """Placeholder Subroutine for AI"""
+    board.makeMove(*pickRandomMove(board))
 
 def handleAIMove(move: tuple, board: hexBoard) -> None:
     """Performs move operation after AI has selected a move."""
@@ -609,7 +1841,7 @@ def handleAIMove(move: tuple, board: hexBoard) -> None:
         raise RuntimeError(f"AI has requested move {move} on board layout {board.returnCaptureString()} which cannot occur because the source space does not have a black pawn.")
     if not(targetSpace in board.board[sourceSpace[0]][sourceSpace[1]].getMoves(board)):
         raise RuntimeError(f"AI has requested move {move} on board layout {board.returnCaptureString()}, which is an illegal move.")
-    board.overwriteAndMove(sourceSpace[0],sourceSpace[1],targetSpace[0],targetSpace[1])
+    board.makeMove(sourceSpace[0],sourceSpace[1],targetSpace[0],targetSpace[1])
 
 def handleMasterAIMove(move: tuple, board: hexBoard) -> None:
     """Performs move operation after Master AI has selected a move."""
@@ -619,14 +1851,96 @@ def handleMasterAIMove(move: tuple, board: hexBoard) -> None:
         raise RuntimeError(f"Master AI has requested move {move} on board layout {board.returnCaptureString()} which cannot occur because the source space does not have a white pawn.")
     if not(targetSpace in board.board[sourceSpace[0]][sourceSpace[1]].getMoves(board)):
         raise RuntimeError(f"Master AI has requested move {move} on board layout {board.returnCaptureString()}, which is an illegal move.")
-    board.overwriteAndMove(sourceSpace[0],sourceSpace[1],targetSpace[0],targetSpace[1])
+    board.makeMove(sourceSpace[0],sourceSpace[1],targetSpace[0],targetSpace[1])
+
+class PositionCache():
+    """
+    Remembers the legal moves, the layout each move leads to, and whether the game is over, for every position reached.
+
+    A position is a board layout and the side to move. There are only a few dozen reachable positions, so automated games can look each move up instead of working it out on a board.
+
+    `preload` - When `True`, every position reachable from the starting layout is explored straight away. Otherwise positions are added the first time they are looked up.
+
+    `rows, columns` - The size of the board. Preloading gets slow quickly as the board grows.
+
+    A position is also over when the side to move has no legal moves. `hits` and `misses` count the lookups that were and weren't already in the cache.
+    """
+    def __init__(self, preload: bool = False, rows: int = 3, columns: int = 3) -> None:
+        self.board = hexBoard(rows, columns)
+        self.start = self.board.returnCaptureString()
+        self.positions = {True: {}, False: {}}
+        self.hits = 0
+        self.misses = 0
+        if preload: self.explore()
+
+    def __build(self, layout: str, whiteToMove: bool) -> tuple:
+        """Works out a position on the cache's board and stores it."""
+        board = self.board
+        board.loadCaptureString(layout)
+        terminal = checkEndGame(board, whiteToMove)
+        successors = {}
+        if not terminal:
+            for move in board.listMoves(WhitePawn if whiteToMove else BlackPawn):
+                source, target = move.split(">")
+                board.makeMove(*returnCoords(source), *returnCoords(target))
+                successors[move] = board.returnCaptureString()
+                board.unmakeMove()
+        winner = None
+        if terminal: winner = "cpu" if whiteToMove else "master"
+        position = (terminal, winner, successors)
+        self.positions[whiteToMove][layout] = position
+        return position
+
+    def lookup(self, layout: str, whiteToMove: bool) -> tuple:
+        """
+        Returns a position as a tuple of whether the game is over, the winner ("cpu", "master" or `None`), and a dictionary of each legal move string to the layout it leads to.
+
+        The winner is the side that moved last, like in `autoGame()`.
+        """
+        position = self.positions[whiteToMove].get(layout)
+        if position == None:
+            self.misses += 1
+            return self.__build(layout, whiteToMove)
+        self.hits += 1
+        return position
+
+    def successor(self, layout: str, position: tuple, moveData: tuple) -> str:
+        """Returns the layout reached by a move from `pickMove()`. Raises a `RuntimeError` if the move is illegal in the position."""
+        move = moveData[0]+">"+moveData[1]
+        nextLayout = position[2].get(move)
+        if nextLayout == None: raise RuntimeError(f"Move {move} was requested on board layout {layout}, which is an illegal move.")
+        return nextLayout
+
+    def explore(self, layout: str = None, whiteToMove: bool = True) -> int:
+        """Adds every position reachable from a layout, or the starting layout, to the cache, without counting lookups. Returns the number of positions in the cache."""
+        if layout == None: layout = self.start
+        queue = deque([(layout, whiteToMove)])
+        while len(queue) > 0:
+            layout, whiteToMove = queue.popleft()
+            if layout in self.positions[whiteToMove]: continue
+            for nextLayout in self.__build(layout, whiteToMove)[2].values():
+                queue.append((nextLayout, not whiteToMove))
+        return len(self)
+
+    def hitRate(self) -> float:
+        """Returns the fraction of lookups that were already in the cache."""
+        total = self.hits + self.misses
+        return self.hits/total if total > 0 else 0.0
+
+    def resetCounters(self) -> None:
+        """Set the hit and miss counts back to 0."""
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.positions[True]) + len(self.positions[False])
 
 def gameCycle(board: hexBoard, ai: ComputerPlayer, learn: bool = False) -> None:
     """Performs one game cycle."""
     humansTurn = True
     interrupt = False
     board.displayBoard()
-    while not checkEndGame(board) and not interrupt:
+    while not checkEndGame(board, humansTurn) and not interrupt:
         if humansTurn:
             interrupt = moveInput(board)
         else:
@@ -640,24 +1954,41 @@ def gameCycle(board: hexBoard, ai: ComputerPlayer, learn: bool = False) -> None:
         if learn: ai.learnFromGame(humansTurn)
     ai.flushArchive()
 
-def autoGame(board: hexBoard, ai: ComputerPlayer, masterAi: MasterPlayer, learn: bool = False, showCommentary: bool = False, returnLogData: bool = False) -> bool:
-    """Automates one game of Hexapawn using an AI and master AI object."""
+def autoGame(board: hexBoard, ai: ComputerPlayer, masterAi: MasterPlayer, learn: bool = False, showCommentary: bool = False, returnLogData: bool = False, logger = None, cache = None) -> bool:
+    """
+    Automates one game of Hexapawn using an AI and master AI object.
+
+    `logger` - A `GameLogger` to record this game in, after `GameLogger.startGame()` has been performed.
+
+    `cache` - A `PositionCache` to look moves up in instead of playing them on the board. Every move is checked, and the board is set to the final layout at the end of the game. The cache isn't used if either player has `strictMoves` set.
+    """
     masterTurn = True
     logData = ""
+    ply = 0
+    layout = board.returnCaptureString()
+    position = None if cache == None or ai.strictMoves or masterAi.strictMoves else cache.lookup(layout, True)
     #board.displayBoard()
-    while not checkEndGame(board):
+    while not (checkEndGame(board, masterTurn) if position == None else position[0]):
+        if position == None: layout = board.returnCaptureString()
         if masterTurn:
-            moveData = masterAi.pickMove(board.returnCaptureString())
-            handleMasterAIMove(moveData, board)
+            moveData = masterAi.pickMove(layout)
+            if position == None: masterAi.applyMove(layout, moveData, board)
             if showCommentary: print(f"Master Player has moved from {moveData[0]} to {moveData[1]}")
             if returnLogData: logData += f"Master Player has moved from {moveData[0]} to {moveData[1]}\n"
         else:
-            moveData = ai.recordAndPickMove(board.returnCaptureString())
-            handleAIMove(moveData, board)
+            moveData = ai.pickMove(layout)
+            ai.archiveMove(layout, moveData[3])
+            if position == None: ai.applyMove(layout, moveData, board)
             if showCommentary: print(f"Opponent has moved from {moveData[0]} to {moveData[1]}")
             if returnLogData: logData += f"Opponent has moved from {moveData[0]} to {moveData[1]}\n"
             #board.displayBoard()
+        if logger != None: logger.logMove(ply, layout, moveData[3], moveData[2])
+        ply += 1
         masterTurn = not masterTurn
+        if position != None:
+            layout = cache.successor(layout, position, moveData)
+            position = cache.lookup(layout, masterTurn)
+    if position != None: board.loadCaptureString(layout)
     if masterTurn:
         if showCommentary: print("Computer Wins!")
         if returnLogData: logData += "Computer Won.\n"
@@ -666,40 +1997,1483 @@ def autoGame(board: hexBoard, ai: ComputerPlayer, masterAi: MasterPlayer, learn:
         if showCommentary: print("Master Player Wins!")
         if returnLogData: logData += "Master Player Won.\n"
         output = False
+    if logger != None: logger.endGame(output, ply)
     if learn:
-        ai.learnFromGame(masterTurn)
-        ai.benchmark()
+        if ai.learnFromGame(masterTurn): ai.benchmark()
     else: ai.saveGame(masterTurn)
     ai.flushArchive()
     return (output, logData)
 
-def virtualiseGames(ai: ComputerPlayer, gameCount: int = 25, train: bool = False, showCommentary: bool = False, logWithName: str = None) -> tuple:
-    """Runs a given quantity of automated games"""
+def exactWinProbability(ai: ComputerPlayer, masterAi: MasterPlayer = None) -> tuple:
+    """
+    Calculates the exact chance of an AI beating the Master Player, without playing any games.
+
+    Every reachable position is visited once, and the chance of winning from it is worked out from both players' move probabilities. Probabilities that don't quite add up to 1 are scaled so they do.
+
+    Returns the overall chance of winning, and a dictionary of the chance of winning after each of the Master Player's opening moves.
+    """
+    if masterAi == None: masterAi = MasterPlayer(ai.rows, ai.columns)
+    cache = PositionCache(rows=ai.rows, columns=ai.columns)
+    results = {}
+
+    def chanceOfWinning(layout: str, masterTurn: bool) -> float:
+        if (layout, masterTurn) in results: return results[(layout, masterTurn)]
+        moves = (masterAi if masterTurn else ai).layoutLookup[layout]
+        total = 1.0 if len(moves) == 1 else sum(move[1] for move in moves)
+        chance = 0.0
+        position = cache.lookup(layout, masterTurn)
+        for move in moves:
+            weight = 1.0 if len(moves) == 1 else move[1]/total
+            if weight <= 0: continue
+            nextLayout = cache.successor(layout, position, move[0].split(">"))
+            if cache.lookup(nextLayout, not masterTurn)[0]: chance += 0.0 if masterTurn else weight
+            else: chance += weight*chanceOfWinning(nextLayout, not masterTurn)
+        results[(layout, masterTurn)] = chance
+        return chance
+
+    openings = {}
+    start = cache.lookup(cache.start, True)
+    for move in masterAi.layoutLookup[cache.start]:
+        openings[move[0]] = chanceOfWinning(cache.successor(cache.start, start, move[0].split(">")), False)
+    return (chanceOfWinning(cache.start, True), openings)
+
+class OutcomeSampler():
+    """
+    Plays games as random walks on a compiled graph of positions, without any boards, pawns or layout strings.
+
+    `ai` - The AI to play, and learn, with.
+
+    `masterAi` - The Master Player to play against. A new one is used if none is given.
+
+    Positions are numbered as games first reach them. Each position's moves are stored in flat arrays, as the number of the position each move leads to and its probability, so a game only works with integers and floats. Only positions that are actually played are compiled, so on larger boards the sampler never generates layouts that no game reaches. Moves are picked in the same way as `ComputerPlayer.pickMove()`, so with the same random seed, games are identical to `autoGame()`.
+
+    The probabilities are copied from the players' tables when a position is compiled. `playGames()` copies them again as the AI learns, and `playGames()` and `validate()` start by copying them all, in case the tables have been changed elsewhere. Use `refresh()` before `sampleGame()` if they have. The graph is compiled again automatically if either player's `layoutLookup` is replaced.
+    """
+    def __init__(self, ai: ComputerPlayer, masterAi: MasterPlayer = None) -> None:
+        self.ai = ai
+        self.masterAi = MasterPlayer(ai.rows, ai.columns) if masterAi == None else masterAi
+        self.compile()
+
+    def compile(self) -> int:
+        """Starts a new position graph from both players' tables, holding only the starting position. Positions are added as games reach them. Returns the number of positions."""
+        self.cache = PositionCache(rows=self.ai.rows, columns=self.ai.columns)
+        self.numbers = {(self.cache.start, True): 0}
+        self.keys = [(self.cache.start, True)]
+        self.layouts = [self.cache.start]
+        self.winners = array('b', [-2]) # 1 if the AI has won, 0 if the Master Player has won, -1 if the game isn't over, -2 if not compiled yet
+        self.firstMoves = array('l', [0]) # Where each position's moves start in `targets` and `probabilities`
+        self.moveCounts = array('l', [0])
+        self.targets = array('l')
+        self.probabilities = array('d')
+        self.compiledFrom = (self.ai.layoutLookup, self.masterAi.layoutLookup)
+        return len(self.keys)
+
+    def __expand(self, state: int) -> int:
+        """Compiles a position reached for the first time, numbering the positions its moves lead to. Returns its winner."""
+        layout, whiteToMove = self.keys[state]
+        position = self.cache.lookup(layout, whiteToMove)
+        if position[0]:
+            self.winners[state] = 1 if position[1] == "cpu" else 0
+            return self.winners[state]
+        moves = (self.masterAi if whiteToMove else self.ai).layoutLookup[layout]
+        self.firstMoves[state] = len(self.targets)
+        self.moveCounts[state] = len(moves)
+        for move in moves:
+            key = (self.cache.successor(layout, position, move[0].split(">")), not whiteToMove)
+            if not key in self.numbers:
+                self.numbers[key] = len(self.keys)
+                self.keys.append(key)
+                self.layouts.append(key[0])
+                self.winners.append(-2)
+                self.firstMoves.append(0)
+                self.moveCounts.append(0)
+            self.targets.append(self.numbers[key])
+            self.probabilities.append(move[1])
+        self.winners[state] = -1
+        return -1
+
+    def refresh(self, states = None) -> None:
+        """Copies the current move probabilities of compiled positions, or only of `states`, from the players' tables."""
+        if self.compiledFrom[0] is not self.ai.layoutLookup or self.compiledFrom[1] is not self.masterAi.layoutLookup:
+            self.compile()
+            return
+        for state in range(len(self.keys)) if states == None else states:
+            if self.winners[state] != -1: continue
+            layout, whiteToMove = self.keys[state]
+            first = self.firstMoves[state]
+            for i, move in enumerate((self.masterAi if whiteToMove else self.ai).layoutLookup[layout]): self.probabilities[first+i] = move[1]
+
+    def sampleGame(self) -> tuple:
+        """Plays one game. Returns whether the AI won, the number of moves played, and the AI's moves as pairs of position number and move index."""
+        if self.compiledFrom[0] is not self.ai.layoutLookup or self.compiledFrom[1] is not self.masterAi.layoutLookup: self.compile()
+        winners, firstMoves, moveCounts, targets, probabilities = (self.winners, self.firstMoves, self.moveCounts, self.targets, self.probabilities)
+        state = 0
+        plies = 0
+        masterTurn = True
+        trajectory = []
+        while True:
+            winner = winners[state]
+            if winner == -2: winner = self.__expand(state)
+            if winner >= 0: break
+            first = firstMoves[state]
+            count = moveCounts[state]
+            index = 0
+            if count != 1:
+                selection = random()
+                accumulator = 0
+                for index in range(count):
+                    accumulator += probabilities[first+index]
+                    if accumulator - selection > 0: break
+                else: raise TypeError(f"Move couldn't be picked because random value {selection} was not properly allocated a probability on board layout {self.layouts[state]}.")
+            if not masterTurn: trajectory.append((state, index))
+            state = targets[first+index]
+            plies += 1
+            masterTurn = not masterTurn
+        return (winner == 1, plies, trajectory)
+
+    def playGames(self, gameCount: int = 25, train: bool = False) -> tuple:
+        """
+        Plays games like `virtualiseGames()`, with the AI learning from them in the same way if `train` is set. Returns the number of wins and the time taken.
+
+        The AI learns through its own `learnFromGame()`, so any kind of AI can be trained, and the probabilities of the positions it played are copied back into the sampler whenever they change.
+        """
+        if gameCount <= 0: raise ValueError("Argument gameCount must be a positive integer above 0.")
+        self.refresh()
+        ai = self.ai
+        wins = 0
+        learned = set()
+        t = perf_counter()
+        for i in range(gameCount):
+            won, plies, trajectory = self.sampleGame()
+            if won: wins += 1
+            layouts = self.layouts
+            ai.moveArchive = [(layouts[state], index) for state, index in trajectory]
+            if train:
+                for state, index in trajectory: learned.add(state)
+                if ai.learnFromGame(won):
+                    ai.benchmark()
+                    self.refresh(learned)
+                    learned = set()
+            else: ai.saveGame(won)
+            ai.flushArchive()
+        if train and ai.applyBatch():
+            ai.benchmark()
+            self.refresh(learned)
+        return (wins, perf_counter() - t)
+
+    def validate(self, gameCount: int = 10000, seed: int = 0) -> dict:
+        """
+        Compares the outcomes of sampled games with games played by `autoGame()`, from the same random seed, without changing the AI.
+
+        Returns the number of games with each winner and length for both, and the total variation distance between the two distributions, which is 0 when they match.
+        """
+        sampled = {}
+        self.refresh()
+        seedRandom(seed)
+        for i in range(gameCount):
+            won, plies, trajectory = self.sampleGame()
+            key = ("cpu" if won else "master", plies)
+            sampled[key] = sampled.get(key, 0) + 1
+        played = {}
+        ai = deepcopy(self.ai)
+        board = hexBoard(ai.rows, ai.columns)
+        cache = PositionCache(rows=ai.rows, columns=ai.columns)
+        seedRandom(seed)
+        for i in range(gameCount):
+            board.reset()
+            won, logData = autoGame(board, ai, self.masterAi, returnLogData=True, cache=cache)
+            key = ("cpu" if won else "master", logData.count("\n")-1)
+            played[key] = played.get(key, 0) + 1
+        distance = sum(abs(sampled.get(key, 0) - played.get(key, 0)) for key in set(sampled) | set(played))/(2*gameCount)
+        return {"sampled": sampled, "played": played, "distance": distance}
+
+class LearningMasterPlayer(MasterPlayer):
+    """
+    A Master Player that learns from its games, so White can be trained at the same time as the AI for self-play.
+
+    `learnFactor, batchSize` - Work like they do for `ComputerPlayer`.
+
+    `rows, columns` - The size of board to play on.
+
+    White's moves have no quality, so its benchmark score is always 0.
+    """
+    def __init__(self, learnFactor: float = 0.01, batchSize: int = 1, rows: int = 3, columns: int = 3) -> None:
+        super().__init__(rows, columns)
+        self.learnFactor = learnFactor
+        self.moveArchive = []
+        self.batchSize = batchSize
+        self.batchCounts = {}
+        self.batchGames = 0
+        self.updateCount = 0
+        self.gameCount = 0
+        self.winCount = 0
+        self.benchmarkScore = 0
+        self.benchmarkArchive = []
+        self.summaryCache = None
+
+    def benchmark(self) -> int:
+        """White's moves have no quality, so this is always 0."""
+        self.benchmarkArchive.append(0)
+        return 0
+
+class RandomPlayer():
+    """
+    A White player that moves at random in the same way as `randomMove()`, for use in an `OpponentPool`.
+
+    `rows, columns` - The size of board to play on.
+    """
+    def __init__(self, rows: int = 3, columns: int = 3) -> None:
+        self.board = hexBoard(rows, columns)
+
+    def pickMove(self, boardString: str) -> tuple:
+        """Select a move given the string layout of the board. The probability and index are `None`, as the move doesn't come from a table."""
+        self.board.loadCaptureString(boardString)
+        sourceX, sourceY, targetX, targetY = pickRandomMove(self.board, WhitePawn)
+        return (outputCoords(sourceX, sourceY), outputCoords(targetX, targetY), None, None)
+
+class PolicySnapshot():
+    """
+    A frozen copy of a White player's move probabilities, made by `OpponentPool.addSnapshot()`.
+
+    Snapshots from the same pool share one index of layouts and move strings, so each snapshot only stores its probabilities, in a flat array.
+    """
+    __slots__ = ("values", "offsets", "fallback")
+
+    def __init__(self, values: array, offsets: dict, fallback: dict = None) -> None:
+        self.values = values
+        self.offsets = offsets
+        self.fallback = fallback
+
+    def pickMove(self, boardString: str) -> tuple:
+        """Select a move given the string layout of the board, in the same way as `ComputerPlayer.pickMove()`."""
+        entry = self.offsets.get(boardString)
+        if entry == None or entry[0] >= len(self.values):
+            if self.fallback == None: raise KeyError(boardString)
+            moves = self.fallback[boardString]
+            entry = (None, [move[0] for move in moves])
+            probabilities = [move[1] for move in moves]
+        else: probabilities = self.values[entry[0]:entry[0]+len(entry[1])]
+        index = 0
+        if len(probabilities) != 1:
+            selection = random()
+            accumulator = 0
+            for index in range(len(probabilities)):
+                accumulator += probabilities[index]
+                if accumulator - selection > 0: break
+            else: raise TypeError(f"Snapshot couldn't pick a move because random value {selection} was not properly allocated a probability.")
+        output = entry[1][index].split(">")
+        return (output[0], output[1], probabilities[index], index)
+
+class OpponentPool():
+    """
+    A set of White opponents for `trainAgainstPool()`, each picked for a game in proportion to its weight.
+
+    `rows, columns` - The size of board the opponents play on.
+
+    `maxSnapshots` - The most snapshots kept at once. The oldest is removed when another is added.
+
+    An opponent can be any White player with a `pickMove()` method: `MasterPlayer`, `RandomPlayer`, `PolicySnapshot` or `LearningMasterPlayer`. Learning players learn from every game they play. `entries` holds each opponent's name, player, weight, games played and games the AI won.
+    """
+    def __init__(self, rows: int = 3, columns: int = 3, maxSnapshots: int = 10) -> None:
+        self.rows = rows
+        self.columns = columns
+        self.maxSnapshots = maxSnapshots
+        self.entries = []
+        self.snapshots = deque()
+        self.offsets = {}
+        self.size = 0
+        self.fallback = None if rows == 3 and columns == 3 else GeneratedLayouts(rows, columns, WhitePawn)
+
+    def add(self, name: str, player, weight: float = 1.0) -> list:
+        """Adds an opponent to the pool. Returns its entry."""
+        if weight <= 0: raise ValueError("Argument weight must be a positive number above 0.")
+        entry = [name, player, weight, 0, 0]
+        self.entries.append(entry)
+        return entry
+
+    def addRandom(self, weight: float = 1.0) -> list:
+        """Adds a `RandomPlayer` to the pool."""
+        return self.add("random", RandomPlayer(self.rows, self.columns), weight)
+
+    def addMaster(self, weight: float = 1.0) -> list:
+        """Adds a `MasterPlayer` to the pool."""
+        return self.add("master", MasterPlayer(self.rows, self.columns), weight)
+
+    def addSnapshot(self, player: MasterPlayer, weight: float = 1.0, name: str = None) -> list:
+        """Adds a frozen `PolicySnapshot` of a White player's current move probabilities to the pool."""
+        for layout, moves in player.layoutLookup.items():
+            if not layout in self.offsets:
+                self.offsets[layout] = (self.size, [move[0] for move in moves])
+                self.size += len(moves)
+        values = array("d", bytes(8*self.size))
+        for layout, moves in player.layoutLookup.items():
+            offset = self.offsets[layout][0]
+            for i in range(len(moves)): values[offset+i] = moves[i][1]
+        if len(self.snapshots) >= self.maxSnapshots: self.entries.remove(self.snapshots.popleft())
+        entry = self.add(f"snapshot {player.gameCount if name == None else name}", PolicySnapshot(values, self.offsets, self.fallback), weight)
+        self.snapshots.append(entry)
+        return entry
+
+    def pick(self) -> list:
+        """Returns the entry of a randomly picked opponent."""
+        selection = random()*sum(entry[2] for entry in self.entries)
+        for entry in self.entries:
+            selection -= entry[2]
+            if selection < 0: return entry
+        return self.entries[-1]
+
+def trainAgainstPool(ai: ComputerPlayer, pool: OpponentPool, gameCount: int = 10000, learner: LearningMasterPlayer = None, snapshotInterval: int = None, snapshotWeight: float = 1.0) -> tuple:
+    """
+    Trains an AI against opponents picked from an `OpponentPool`.
+
+    `learner` - A `LearningMasterPlayer` to add a snapshot of to the pool every `snapshotInterval` games, with `snapshotWeight`. Add the learner to the pool as well for self-play.
+
+    The AI and any learning opponent both learn from each game in the same loop, and games are played through a `PositionCache`.
+
+    Returns the number of wins and the time taken.
+    """
+    if gameCount <= 0: raise ValueError("Argument gameCount must be a positive integer above 0.")
+    if len(pool.entries) == 0: raise ValueError("Argument pool must contain at least one opponent.")
+    cache = PositionCache(rows=ai.rows, columns=ai.columns)
+    wins = 0
+    t = perf_counter()
+    for i in range(gameCount):
+        entry = pool.pick()
+        opponent = entry[1]
+        learns = isinstance(opponent, LearningMasterPlayer)
+        layout = cache.start
+        masterTurn = True
+        position = cache.lookup(layout, True)
+        while not position[0]:
+            if masterTurn:
+                moveData = opponent.pickMove(layout)
+                if learns: opponent.archiveMove(layout, moveData[3])
+            else:
+                moveData = ai.pickMove(layout)
+                ai.archiveMove(layout, moveData[3])
+            masterTurn = not masterTurn
+            layout = cache.successor(layout, position, moveData)
+            position = cache.lookup(layout, masterTurn)
+        entry[3] += 1
+        if masterTurn:
+            wins += 1
+            entry[4] += 1
+        if ai.learnFromGame(masterTurn): ai.benchmark()
+        ai.flushArchive()
+        if learns:
+            opponent.gameCount += 1
+            if not masterTurn: opponent.winCount += 1
+            opponent.learnFromGame(not masterTurn)
+            opponent.flushArchive()
+        if learner != None and snapshotInterval != None and (i+1) % snapshotInterval == 0: pool.addSnapshot(learner, snapshotWeight)
+    if ai.applyBatch(): ai.benchmark()
+    for entry in pool.entries:
+        if isinstance(entry[1], LearningMasterPlayer): entry[1].applyBatch()
+    return (wins, perf_counter() - t)
+
+class PauseControl():
+    """
+    Lets a `virtualiseGames()` run be paused part way through, saving everything needed to continue it with `resumeGames()`.
+
+    `resumeFile` - Where the run is saved when it is paused.
+
+    `checkInterval` - The number of games between each check for a pause request.
+
+    `onCheck` - Performed at every check, for example to let a window respond to a Pause button.
+
+    Call `pause()` to request a pause. After the run, `paused` shows whether it was paused.
+    """
+    def __init__(self, resumeFile: str, checkInterval: int = 100, onCheck = None) -> None:
+        if checkInterval <= 0: raise ValueError("Argument checkInterval must be a positive integer above 0.")
+        self.resumeFile = resumeFile
+        self.checkInterval = checkInterval
+        self.onCheck = onCheck
+        self.pauseRequested = False
+        self.paused = False
+
+    def pause(self) -> None:
+        """Request that the run pauses at the next check."""
+        self.pauseRequested = True
+
+    def check(self) -> bool:
+        """Returns whether the run should pause now."""
+        if self.onCheck != None: self.onCheck()
+        return self.pauseRequested
+
+def saveResumeFile(fileName: str, ai: ComputerPlayer, state: dict) -> None:
+    """Saves a paused run: the AI, including learning in progress, the run's progress and the random number generator's state."""
+    version, internalState, gauss = getstate()
+    output = dict(state)
+    output["random_state"] = [version, list(internalState), gauss]
+    output["ai"] = ai.resumeData()
+    with open(fileName+".tmp", "w") as file:
+        file.write(dumps(output))
+    replace(fileName+".tmp", fileName)
+
+def virtualiseGames(ai: ComputerPlayer, gameCount: int = 25, train: bool = False, showCommentary: bool = False, logWithName: str = None, monitor: ConvergenceMonitor = None, metrics: TrainingMetrics = None, logger: GameLogger = None, control: PauseControl = None, resumeState: dict = None, cache: PositionCache = None) -> tuple:
+    """
+    Runs a given quantity of automated games
+
+    `monitor` - A `ConvergenceMonitor`, or a `SequentialTest` when testing, that can stop the run before `gameCount` games. Its `gamesPlayed` holds the number of games that were played.
+
+    `metrics` - A `TrainingMetrics` object to publish live statistics about the run.
+
+    `logger` - A `GameLogger` to write a compact structured log to. It is not closed afterwards, so several runs can share one log.
+
+    `control` - A `PauseControl` that lets the run be paused to a resume file.
+
+    `resumeState` - The progress of a paused run to continue from. Use `resumeGames()` rather than passing this directly.
+
+    `cache` - The `PositionCache` that games are played through. A new one is used if none is given. Its hit and miss counts carry on from earlier runs.
+
+    When the AI's `strictMoves` is set, the cache is skipped and every move of both players is played and checked on the board instead.
+    """
     if gameCount <= 0: raise ValueError("Argument gameCount must be a positive integer above 0.")
     wins = 0
+    firstGame = 0
+    elapsed = 0.0
+    board = hexBoard(ai.rows, ai.columns)
+    masterAI = MasterPlayer(ai.rows, ai.columns)
+    masterAI.strictMoves = ai.strictMoves
+    if cache == None: cache = PositionCache(rows=ai.rows, columns=ai.columns)
+    logFile = None
+    pendingBytes = 0
+
+    def writeLog(text: str) -> int:
+        """Writes text to the log straight away, and returns the number of bytes written."""
+        data = text.encode()
+        logFile.write(data)
+        return len(data)
+
+    if logWithName != None: logFile = open(logWithName, "ab")
+    if resumeState != None:
+        wins = resumeState["wins"]
+        firstGame = resumeState["games_done"]
+        elapsed = resumeState["elapsed"]
+        if logFile != None: logFile.truncate(resumeState["log_position"])
+    elif logFile != None: pendingBytes = writeLog(f"Automated Games Log for Hexapawn AI, Started: {ctime()}\n{gameCount} total games, Training: {train}, Commentary: {showCommentary}\n")
+    if monitor != None:
+        if resumeState != None and resumeState.get("monitor") != None: monitor.loadState(resumeState["monitor"]["progress"])
+        else: monitor.begin(ai)
+    if metrics != None: metrics.begin(ai, cache)
+    if control != None: control.paused = False
+    t = perf_counter()
+
+    try:
+        for i in range(firstGame, gameCount):
+            gameLogger = logger if logger != None and logger.startGame() else None
+            won, gameLog = autoGame(board, ai, masterAI, train, showCommentary, (logFile != None), gameLogger, cache)
+            if won: wins += 1
+            logBytes = pendingBytes
+            pendingBytes = 0
+            if logFile != None: logBytes += writeLog(f"----- Game {i+1} of {gameCount} -----\n"+gameLog)
+            board.reset()
+            stop = monitor != None and monitor.check(ai, i+1)
+            if stop:
+                if showCommentary: print(f"{monitor.reason}, stopped after {i+1} games.")
+                if logFile != None: logBytes += writeLog(f"{monitor.reason}, stopped after {i+1} games.\n")
+            if metrics != None: metrics.recordGame(won, logBytes)
+            if stop: break
+            if control != None and (i+1) % control.checkInterval == 0 and i+1 < gameCount and control.check():
+                control.paused = True
+                control.pauseRequested = False
+                break
+        if train and not (control != None and control.paused) and ai.applyBatch(): ai.benchmark()
+        logPosition = 0 if logFile == None else logFile.tell()
+    finally:
+        if logFile != None: logFile.close()
+    if metrics != None: metrics.publish()
+
+    time = perf_counter() - t + elapsed
+    if control != None and control.paused:
+        saveResumeFile(control.resumeFile, ai, {
+            "game_count": gameCount,
+            "games_done": i+1,
+            "wins": wins,
+            "train": train,
+            "show_commentary": showCommentary,
+            "log_name": logWithName,
+            "log_position": logPosition,
+            "elapsed": time,
+            "monitor": None if monitor == None else monitor.saveState()
+        })
+        if showCommentary: print(f"Paused after {i+1} of {gameCount} games, saved to {control.resumeFile}.")
+    return (wins, time)
+
+def resumeGames(resumeFile: str, ai: ComputerPlayer = None, control: PauseControl = None, metrics: TrainingMetrics = None, logger: GameLogger = None, monitor = None) -> tuple:
+    """
+    Continues a run paused by a `PauseControl`, exactly as if it had never stopped.
+
+    `ai` - The AI to continue with. All of its data is overwritten by the AI in the resume file. If none is given, a new AI of the same kind as the paused one is used.
+
+    `control` - A `PauseControl` so the continued run can be paused again.
+
+    `monitor` - The `ConvergenceMonitor` or `SequentialTest` to continue with. Its progress is replaced by the one in the resume file. If none is given and the paused run had one, it is rebuilt from the resume file. Use `readResumeMonitor()` to get it beforehand.
+
+    Returns the AI, and the total wins and time taken from `virtualiseGames()`.
+    """
+    with open(resumeFile, 'r') as file:
+        state = loads(file.read())
+    data = state["ai"]
+    if ai == None: ai = {"ComputerPlayer": ComputerPlayer, "BeadPlayer": BeadPlayer}[data.get("player", "ComputerPlayer")](**data.get("settings", {}))
+    ai.useModelData(data)
+    ai.learnFactor = data["learn_factor"]
+    ai.batchSize = data["batch_size"]
+    ai.batchCounts = data["batch_counts"]
+    ai.batchGames = data["batch_games"]
+    ai.updateCount = data["update_count"]
+    ai.strictMoves = data["strict_moves"]
+    ai.moveArchive = []
+    version, internalState, gauss = state["random_state"]
+    setstate((version, tuple(internalState), gauss))
+    if monitor == None and state.get("monitor") != None: monitor = monitorFromState(state["monitor"])
+    wins, time = virtualiseGames(ai, state["game_count"], state["train"], state["show_commentary"], state["log_name"], monitor, metrics=metrics, logger=logger, control=control, resumeState=state)
+    return (ai, wins, time)
+
+def readResumeMonitor(resumeFile: str):
+    """Returns the monitor of a paused run, rebuilt with `monitorFromState()`, or `None` if the run had none."""
+    with open(resumeFile, 'r') as file:
+        state = loads(file.read()).get("monitor")
+    return None if state == None else monitorFromState(state)
+
+def measureBoardAllocations(count: int = 10000) -> dict:
+    """
+    Uses `tracemalloc` to measure the memory allocated by creating a new board for every game, compared to resetting one board.
+
+    Also measures the memory used by one pawn.
+
+    Returns a dictionary of the average bytes for each.
+    """
+    startTracing()
+    kept = []
+    before = get_traced_memory()[0]
+    for i in range(count): kept.append(hexBoard())
+    newBoardBytes = (get_traced_memory()[0] - before)/count
+    kept = []
     board = hexBoard()
-    masterAI = MasterPlayer()
-    if logWithName != None: log = f"Automated Games Log for Hexapawn AI, Started: {ctime()}\n{gameCount} total games, Training: {train}, Commentary: {showCommentary}\n"
+    before = get_traced_memory()[0]
+    for i in range(count):
+        board.overwriteAndMove(2, 0, 1, 0)
+        board.reset()
+    resetBytes = (get_traced_memory()[0] - before)/count
+    before = get_traced_memory()[0]
+    for i in range(count): kept.append(WhitePawn(2, 0))
+    pawnBytes = (get_traced_memory()[0] - before)/count
+    stopTracing()
+    print(f"New board: {round(newBoardBytes)} bytes, board reset: {round(resetBytes)} bytes, pawn: {round(pawnBytes)} bytes")
+    return {"new_board": newBoardBytes, "reset": resetBytes, "pawn": pawnBytes}
+
+def compareBatchSizes(gameCount: int = 10000, batchSizes: tuple = (1, 10, 100), targetScore: int = 6000, testGames: int = 1000, seed: int = 0) -> dict:
+    """
+    Trains a new AI for each batch size and compares throughput and convergence against learning after every game.
+
+    `targetScore` - The benchmark score an AI must reach to count as converged.
+
+    `testGames` - Number of games used to test each AI once training is done.
+
+    Returns a dictionary of results for each batch size.
+    """
+    results = {}
+    for size in batchSizes:
+        seedRandom(seed)
+        ai = ComputerPlayer(batchSize=size)
+        wins, time = virtualiseGames(ai, gameCount, True)
+        gamesToTarget = None
+        for i in range(len(ai.benchmarkArchive)):
+            if ai.benchmarkArchive[i] >= targetScore:
+                gamesToTarget = min((i+1)*size, gameCount)
+                break
+        testWins = virtualiseGames(ai, testGames, False)[0]
+        results[size] = {
+            "time": time,
+            "games_per_second": gameCount/time,
+            "training_wins": wins,
+            "benchmark": ai.benchmarkScore,
+            "games_to_target": gamesToTarget,
+            "test_win_rate": testWins/testGames
+        }
+        print(f"Batch size {size}: {round(gameCount/time)} games/s, benchmark {ai.benchmarkScore}, reached {targetScore} after {gamesToTarget} games, test win rate {round(testWins/testGames*100, 2)} %")
+    return results
+
+def compareLearners(gameCount: int = 10000, targetScore: int = 6000, testGames: int = 1000, updateGames: int = 5000, seed: int = 0) -> dict:
+    """
+    Trains a new `ComputerPlayer` and a new `BeadPlayer` and compares them.
+
+    `targetScore` - The benchmark score an AI must reach to count as converged.
+
+    `testGames` - Number of games used to test each AI once training is done.
+
+    `updateGames` - Number of recorded games each learner learns from to measure its updates per second, without playing them.
+
+    Returns a dictionary of results for each learner.
+    """
+    seedRandom(seed)
+    sampler = OutcomeSampler(ComputerPlayer())
+    sampler.compile()
+    recorded = []
+    for i in range(updateGames):
+        won, plies, trajectory = sampler.sampleGame()
+        recorded.append(([(sampler.layouts[state], index) for state, index in trajectory], won))
+    results = {}
+    for name, learner in (("Probabilities", ComputerPlayer), ("Beads", BeadPlayer)):
+        ai = learner()
+        updates = 0
+        t = perf_counter()
+        for archive, won in recorded:
+            ai.moveArchive = list(archive)
+            updates += len(archive)
+            ai.learnFromGame(won)
+        updateTime = perf_counter() - t
+        seedRandom(seed)
+        ai = learner()
+        wins, time = virtualiseGames(ai, gameCount, True)
+        gamesToTarget = None
+        for i in range(len(ai.benchmarkArchive)):
+            if ai.benchmarkArchive[i] >= targetScore:
+                gamesToTarget = i+1
+                break
+        testWins = virtualiseGames(ai, testGames, False)[0]
+        results[name] = {
+            "updates_per_second": updates/updateTime,
+            "games_per_second": gameCount/time,
+            "benchmark": ai.benchmarkScore,
+            "games_to_target": gamesToTarget,
+            "test_win_rate": testWins/testGames
+        }
+        print(f"{name}: {round(updates/updateTime)} updates/s, {round(gameCount/time)} games/s, benchmark {ai.benchmarkScore}, reached {targetScore} after {gamesToTarget} games, test win rate {round(testWins/testGames*100, 2)} %")
+    return results
+
+def hashModel(fileSource: str) -> str:
+    """Returns the SHA-256 hash of a ".hexai" file's contents, used to recognise models regardless of their filename."""
+    with open(fileSource, 'rb') as file:
+        return sha256(file.read()).hexdigest()
+
+def _playTournamentPairing(task: tuple) -> tuple:
+    """
+    Plays the games for one tournament pairing. Used as a process pool worker by `runTournament()`.
+
+    When the second file is `None`, the model plays the Master Player directly and scores 1 for every win.
+
+    Otherwise both models play the same seeded games against the Master Player. A game counts as a win for whichever model won it when the other lost, and games both models won or both lost are not counted. This keeps the results on the same scale as games against the Master Player.
+
+    Returns the pairing key, the first model's score and the number of games counted.
+    """
+    key, fileA, fileB, gameCount, seed = task
+    playerA = ComputerPlayer(fileSource=fileA)
+    playerB = None if fileB == None else ComputerPlayer(fileSource=fileB)
+    if playerB != None and (playerA.rows, playerA.columns) != (playerB.rows, playerB.columns): raise ValueError(f"Models {fileA} and {fileB} play on different board sizes.")
+    board = hexBoard(playerA.rows, playerA.columns)
+    cache = PositionCache(rows=playerA.rows, columns=playerA.columns)
+    masterAI = MasterPlayer(playerA.rows, playerA.columns)
+    score = 0
+    counted = 0
+    for i in range(gameCount):
+        seedRandom(seed+i)
+        board.reset()
+        wonA = autoGame(board, playerA, masterAI, cache=cache)[0]
+        if playerB == None:
+            if wonA: score += 1
+            counted += 1
+            continue
+        seedRandom(seed+i)
+        board.reset()
+        wonB = autoGame(board, playerB, masterAI, cache=cache)[0]
+        if wonA != wonB:
+            if wonA: score += 1
+            counted += 1
+    return (key, score, counted)
+
+def calculateRatings(names: list, results: list, iterations: int = 1000) -> dict:
+    """
+    Fits Elo-style ratings to pairwise results, anchored so the first name is rated 0.
+
+    `results` - A list of `(indexA, indexB, scoreA, games)` tuples.
+
+    Every player is given one virtual drawn game against the anchor, so players who won or lost every game still get a finite rating.
+
+    Returns a dictionary of `(rating, standardError)` tuples for each name.
+    """
+    count = len(names)
+    games = [[0.0]*count for i in range(count)]
+    scores = [0.0]*count
+    for a, b, score, played in results:
+        games[a][b] += played
+        games[b][a] += played
+        scores[a] += score
+        scores[b] += played - score
+    for i in range(1, count):
+        games[i][0] += 1
+        games[0][i] += 1
+        scores[i] += 0.5
+        scores[0] += 0.5
+
+    strength = [1.0]*count
+    for n in range(iterations):
+        previous = strength[:]
+        for i in range(count):
+            total = sum(games[i][j]/(strength[i]+strength[j]) for j in range(count) if games[i][j] > 0)
+            if total > 0: strength[i] = max(scores[i], 1e-9)/total
+        strength = [value/strength[0] for value in strength]
+        if max(abs(strength[i]-previous[i])/previous[i] for i in range(count)) < 1e-9: break
+
+    ratings = {}
+    for i in range(count):
+        information = 0.0
+        for j in range(count):
+            if games[i][j] > 0:
+                expected = strength[i]/(strength[i]+strength[j])
+                information += games[i][j]*expected*(1-expected)
+        error = 0.0 if i == 0 or information == 0 else (400/log(10))/sqrt(information)
+        ratings[names[i]] = (400*log10(strength[i]), error)
+    return ratings
+
+def runTournament(directory: str, gameCount: int = 200, processes: int = None, cacheFile: str = None, seed: int = 0, showTable: bool = True) -> list:
+    """
+    Plays a round-robin tournament between every ".hexai" model in a directory, plus each model against the Master Player, and rates them.
+
+    `gameCount` - Number of games played for each pairing. Two models are compared by playing the same seeded games against the Master Player, see `_playTournamentPairing()`.
+
+    `processes` - Number of worker processes. Defaults to the number of CPUs.
+
+    `cacheFile` - JSON file where pairing results are kept, keyed by the models' content hashes. Defaults to "tournament-cache.json" inside `directory`, so re-running only plays new pairings.
+
+    Returns a list of dictionaries, one per player, sorted from highest to lowest rating. Ratings are Elo-style, with the Master Player fixed at 0 and a 95% confidence interval.
+    """
+    if gameCount <= 0: raise ValueError("Argument gameCount must be a positive integer above 0.")
+    if cacheFile == None: cacheFile = path.join(directory, "tournament-cache.json")
+    models = {}
+    for filename in sorted(listdir(directory)):
+        if filename.endswith(".hexai"):
+            models[filename] = hashModel(path.join(directory, filename))
+    names = ["MasterPlayer"] + list(models)
+    files = {}
+    for name, modelHash in models.items():
+        if not modelHash in files: files[modelHash] = path.join(directory, name)
+
+    cache = {}
+    if path.exists(cacheFile):
+        with open(cacheFile, 'r') as file:
+            cache = loads(file.read())
+
+    hashes = sorted(files)
+    pairings = [(modelHash, None) for modelHash in hashes]
+    pairings += [(hashes[i], hashes[j]) for i in range(len(hashes)) for j in range(i+1, len(hashes))]
+    tasks = []
+    for hashA, hashB in pairings:
+        key = f"{hashA}:{'master' if hashB == None else hashB}:{gameCount}:{seed}"
+        if not key in cache:
+            gameSeed = int(sha256(key.encode()).hexdigest()[:8], 16)
+            tasks.append((key, files[hashA], None if hashB == None else files[hashB], gameCount, gameSeed))
+
+    try:
+        if len(tasks) > 0:
+            with ProcessPoolExecutor(processes) as pool:
+                for key, score, played in pool.map(_playTournamentPairing, tasks):
+                    cache[key] = [score, played]
+    finally:
+        with open(cacheFile, "w") as file:
+            file.write(dumps(cache))
+
+    # Files with identical contents are rated as one player.
+    players = ["master"] + hashes
+    results = []
+    totals = {player: [0, 0] for player in players}
+    for hashA, hashB in pairings:
+        playerB = "master" if hashB == None else hashB
+        score, played = cache[f"{hashA}:{playerB}:{gameCount}:{seed}"]
+        results.append((players.index(hashA), players.index(playerB), score, played))
+        totals[hashA][0] += score
+        totals[playerB][0] += played - score
+        totals[hashA][1] += played
+        totals[playerB][1] += played
+    ratings = calculateRatings(players, results)
+
+    table = []
+    for name in names:
+        player = "master" if name == "MasterPlayer" else models[name]
+        rating, error = ratings[player]
+        table.append({
+            "name": name,
+            "hash": models.get(name),
+            "rating": rating,
+            "low": rating - 1.96*error,
+            "high": rating + 1.96*error,
+            "score": totals[player][0],
+            "games": totals[player][1]
+        })
+    table.sort(key=lambda row: row["rating"], reverse=True)
+    if showTable:
+        print(f"{'Model':<32}{'Rating':>8}{'95% CI':>18}{'Score':>14}")
+        for row in table:
+            interval = f"{round(row['low'])} to {round(row['high'])}"
+            score = f"{row['score']:g}/{row['games']}"
+            print(f"{row['name'][:31]:<32}{round(row['rating']):>8}{interval:>18}{score:>14}")
+    return table
+
+def diffLayouts(layoutLookup: dict, base: dict) -> dict:
+    """Returns the layouts from `layoutLookup` whose moves or probabilities differ from `base`."""
+    return {layout: moves for layout, moves in layoutLookup.items() if base.get(layout) != moves}
+
+def applyLayoutDiff(base: dict, diff: dict) -> dict:
+    """Returns a new `layoutLookup` made from a copy of `base` with the layouts in `diff` replaced."""
+    lookup = {layout: [move[:] for move in moves] for layout, moves in base.items()}
+    for layout, moves in diff.items():
+        lookup[layout] = [move[:] for move in moves]
+    return lookup
+
+def readModelFile(fileSource: str) -> dict:
+    """
+    Reads the data in a ".hexai" file. If the file was saved with a base AI, its full `AI_Data` is rebuilt from the base's layouts and the layouts saved in the file.
+
+    Raises a `ValueError` if a base file has changed since the file was saved.
+    """
+    with open(fileSource, 'r') as file:
+        fileData = loads(file.read())
+    if "AI_Diff" in fileData:
+        base = fileData["base"]
+        if base == "default":
+            rows, columns = fileData.get("board_size", (3, 3))
+            baseLayouts = ComputerPlayer(rows=rows, columns=columns).layoutLookup
+        else:
+            baseSource = path.join(path.dirname(fileSource), base["file"])
+            if hashModel(baseSource) != base["sha256"]: raise ValueError(f"Base model {baseSource} has changed since {fileSource} was saved.")
+            baseLayouts = readModelFile(baseSource)["AI_Data"]
+        fileData["AI_Data"] = applyLayoutDiff(baseLayouts, fileData["AI_Diff"])
+    return fileData
+
+class ModelRegistry():
+    """
+    A local store of AI snapshots, kept in a directory.
+
+    `directory` - Where the registry is kept. It is created if it doesn't exist.
+
+    Each snapshot only stores the layouts that differ from its base policy (the default AI, or another snapshot). Benchmark histories are stored as a chain of chunks of `historyChunkSize` scores, each pointing to the chunk before it, so snapshots from the same training run share every full chunk of their history. Policies and chunks are stored once per unique content, named by their SHA-256 hash, so identical snapshots take no extra space. Snapshot details are kept in "index.json", so they can be listed without loading any models.
+    """
+    historyChunkSize = 256
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.objectDirectory = path.join(directory, "objects")
+        self.indexFile = path.join(directory, "index.json")
+        makedirs(self.objectDirectory, exist_ok=True)
+        self.index = {}
+        if path.exists(self.indexFile):
+            with open(self.indexFile, 'r') as file:
+                self.index = loads(file.read())
+
+    def __saveIndex(self) -> None:
+        with open(self.indexFile+".tmp", "w") as file:
+            file.write(dumps(self.index, indent=1))
+        replace(self.indexFile+".tmp", self.indexFile)
+
+    def __storeObject(self, data) -> str:
+        content = dumps(data, sort_keys=True, separators=(",", ":"))
+        contentHash = sha256(content.encode()).hexdigest()
+        objectFile = path.join(self.objectDirectory, contentHash+".json")
+        if not path.exists(objectFile):
+            with open(objectFile, "w") as file:
+                file.write(content)
+        return contentHash
+
+    def __loadObject(self, contentHash: str):
+        with open(path.join(self.objectDirectory, contentHash+".json"), 'r') as file:
+            return loads(file.read())
+
+    def __storeHistory(self, history: list) -> str:
+        chunkHash = None
+        for i in range(0, len(history), self.historyChunkSize):
+            chunkHash = self.__storeObject({"previous": chunkHash, "scores": history[i:i+self.historyChunkSize]})
+        if chunkHash == None: chunkHash = self.__storeObject({"previous": None, "scores": []})
+        return chunkHash
+
+    def __historyChunks(self, chunkHash: str) -> list:
+        """Returns the hashes of a history's chunks, last first."""
+        chunks = []
+        while chunkHash != None:
+            chunks.append(chunkHash)
+            chunkHash = self.__loadObject(chunkHash)["previous"]
+        return chunks
+
+    def __loadHistory(self, chunkHash: str) -> list:
+        history = []
+        for chunkHash in reversed(self.__historyChunks(chunkHash)): history.extend(self.__loadObject(chunkHash)["scores"])
+        return history
+
+    def layouts(self, snapshotId: str = None, rows: int = 3, columns: int = 3) -> dict:
+        """Returns the full `layoutLookup` of a snapshot, or of a new AI for a `rows` by `columns` board when no ID is given."""
+        if snapshotId == None: return ComputerPlayer(rows=rows, columns=columns).layoutLookup
+        if not snapshotId in self.index: raise KeyError(f"No snapshot with ID {snapshotId} in the registry.")
+        rows, columns = self.index[snapshotId].get("board_size", (3, 3))
+        chain = []
+        while snapshotId != None:
+            entry = self.index[snapshotId]
+            chain.append(entry["policy"])
+            snapshotId = entry["base"]
+        diff = {}
+        for policyHash in reversed(chain): diff.update(self.__loadObject(policyHash))
+        return applyLayoutDiff(ComputerPlayer(rows=rows, columns=columns).layoutLookup, diff)
+
+    def save(self, ai: ComputerPlayer, name: str = None, tags: list = (), metadata: dict = None, base: str = None) -> str:
+        """
+        Add a snapshot of an AI and return its ID.
+
+        `tags` - Labels to find the snapshot by later.
+
+        `metadata` - Any extra JSON-compatible details to keep with the snapshot.
+
+        `base` - The ID of the snapshot to store the differences from. Defaults to the default AI.
+
+        If an identical snapshot is already stored, its ID is returned and the new tags are added to it. Raises a `ValueError` if the base snapshot is for a different board size.
+        """
+        if base != None and list(self.index[base].get("board_size", (3, 3))) != [ai.rows, ai.columns]: raise ValueError(f"Snapshot {base} is for a different board size.")
+        diff = diffLayouts(ai.layoutLookup, self.layouts(base, ai.rows, ai.columns))
+        policyHash = self.__storeObject(diff)
+        historyHash = self.__storeHistory(ai.benchmarkArchive)
+        details = {
+            "base": base,
+            "policy": policyHash,
+            "history": historyHash,
+            "games": ai.gameCount,
+            "wins": ai.winCount,
+            "benchmark": ai.benchmarkScore,
+            "learnFactor": ai.learnFactor
+        }
+        if ai.rows != 3 or ai.columns != 3: details["board_size"] = [ai.rows, ai.columns]
+        snapshotId = sha256(dumps(details, sort_keys=True).encode()).hexdigest()[:16]
+        if snapshotId in self.index:
+            entry = self.index[snapshotId]
+            entry["tags"] = sorted(set(entry["tags"]) | set(tags))
+        else:
+            entry = dict(details)
+            entry["id"] = snapshotId
+            entry["name"] = name
+            entry["tags"] = sorted(set(tags))
+            entry["created"] = ctime()
+            entry["layouts"] = len(diff)
+            entry["metadata"] = {} if metadata == None else metadata
+            self.index[snapshotId] = entry
+        self.__saveIndex()
+        return snapshotId
+
+    def importFile(self, fileSource: str, name: str = None, tags: list = (), metadata: dict = None, base: str = None) -> str:
+        """Add a snapshot from a ".hexai" file and return its ID. The filename is used as the name if none is given."""
+        return self.save(ComputerPlayer(fileSource=fileSource), path.basename(fileSource) if name == None else name, tags, metadata, base)
+
+    def listSnapshots(self, tag: str = None) -> list:
+        """Returns the details of every snapshot, or only those with the given tag, oldest first. No models are loaded."""
+        return [entry for entry in self.index.values() if tag == None or tag in entry["tags"]]
+
+    def tag(self, snapshotId: str, *tags: str) -> None:
+        """Add tags to a snapshot."""
+        entry = self.index[snapshotId]
+        entry["tags"] = sorted(set(entry["tags"]) | set(tags))
+        self.__saveIndex()
+
+    def untag(self, snapshotId: str, *tags: str) -> None:
+        """Remove tags from a snapshot."""
+        entry = self.index[snapshotId]
+        entry["tags"] = sorted(set(entry["tags"]) - set(tags))
+        self.__saveIndex()
+
+    def load(self, snapshotId: str) -> ComputerPlayer:
+        """Build a `ComputerPlayer` from a snapshot."""
+        entry = self.index[snapshotId]
+        ai = ComputerPlayer(entry["learnFactor"], rows=entry.get("board_size", (3, 3))[0], columns=entry.get("board_size", (3, 3))[1])
+        ai.useLayouts(self.layouts(snapshotId))
+        ai.gameCount = entry["games"]
+        ai.winCount = entry["wins"]
+        ai.benchmarkScore = entry["benchmark"]
+        ai.benchmarkArchive = self.__loadHistory(entry["history"])
+        return ai
+
+    def remove(self, snapshotId: str) -> None:
+        """Remove a snapshot, and any stored data no other snapshot uses. Snapshots based on it can't be removed first."""
+        for entry in self.index.values():
+            if entry["base"] == snapshotId: raise ValueError(f"Snapshot {entry['id']} is based on snapshot {snapshotId}.")
+        entry = self.index.pop(snapshotId)
+        self.__saveIndex()
+        used = set()
+        for other in self.index.values():
+            used.add(other["policy"])
+            used.update(self.__historyChunks(other["history"]))
+        for contentHash in [entry["policy"]]+self.__historyChunks(entry["history"]):
+            if not contentHash in used: remove(path.join(self.objectDirectory, contentHash+".json"))
+
+class SharedMove():
+    """
+    Stands in for a `[move, probability, quality]` list in a `layoutLookup`, but keeps the probability in a `SharedPolicy`.
+
+    Index 1 reads and writes shared memory, so the normal `ComputerPlayer` methods work unchanged.
+    """
+    __slots__ = ("values", "offset", "move", "quality")
+
+    def __init__(self, values: memoryview, offset: int, move: str, quality: int) -> None:
+        self.values = values
+        self.offset = offset
+        self.move = move
+        self.quality = quality
+
+    def __len__(self) -> int: return 3
+
+    def __getitem__(self, index: int):
+        if index == 1: return self.values[self.offset]
+        return (self.move, None, self.quality)[index]
+
+    def __setitem__(self, index: int, value: float) -> None:
+        if index != 1: raise TypeError("Only the probability of a shared move can be changed.")
+        self.values[self.offset] = value
+
+class SharedPolicy():
+    """
+    Move probabilities held in a `multiprocessing.shared_memory` block, so several processes can train the same AI in place.
+
+    `ai` - The AI to copy the probabilities and layout/move index from, when creating a new block.
+
+    `workers` - Number of worker counter slots to reserve. Each slot holds a games played and a games won count.
+
+    `name`, `spec` - Attach to an existing block instead, using its `name` and `spec` from the process that created it.
+
+    Every move has a fixed position in the block, given by the order of `spec`. Updates are not locked, so processes may occasionally overwrite each other's changes.
+    """
+    def __init__(self, ai: ComputerPlayer = None, workers: int = 1, name: str = None, spec: tuple = None) -> None:
+        if name == None:
+            layouts = []
+            for layout, moves in ai.layoutLookup.items():
+                layouts.append((layout, tuple((move[0], move[2]) for move in moves)))
+            moveCount = sum(len(moves) for layout, moves in layouts)
+            self.spec = (tuple(layouts), moveCount, workers)
+            self.memory = SharedMemory(create=True, size=(moveCount+workers*2)*8)
+            self.owner = True
+        else:
+            self.spec = spec
+            self.memory = SharedMemory(name=name)
+            self.owner = False
+        self.name = self.memory.name
+        self.values = self.memory.buf.cast('d')
+        self.moveCount = self.spec[1]
+        self.workers = self.spec[2]
+        if self.owner:
+            offset = 0
+            for layout, moves in ai.layoutLookup.items():
+                for move in moves:
+                    self.values[offset] = move[1]
+                    offset += 1
+            for i in range(self.workers*2): self.values[self.moveCount+i] = 0
+
+    def sharedLookup(self) -> dict:
+        """Returns a `layoutLookup` whose probabilities are read from and written to shared memory."""
+        lookup = {}
+        offset = 0
+        for layout, moves in self.spec[0]:
+            lookup[layout] = [SharedMove(self.values, offset+i, moves[i][0], moves[i][1]) for i in range(len(moves))]
+            offset += len(moves)
+        return lookup
+
+    def toLayoutLookup(self) -> dict:
+        """Returns an ordinary copy of the current probabilities, as used by `ComputerPlayer`."""
+        lookup = {}
+        offset = 0
+        for layout, moves in self.spec[0]:
+            lookup[layout] = [[moves[i][0], self.values[offset+i], moves[i][1]] for i in range(len(moves))]
+            offset += len(moves)
+        return lookup
+
+    def recordGames(self, worker: int, games: int, wins: int) -> None:
+        """Set the number of games played and won by a worker."""
+        self.values[self.moveCount+worker*2] = games
+        self.values[self.moveCount+worker*2+1] = wins
+
+    def totals(self) -> tuple:
+        """Returns the number of games played and won across all workers."""
+        games = sum(self.values[self.moveCount+i*2] for i in range(self.workers))
+        wins = sum(self.values[self.moveCount+i*2+1] for i in range(self.workers))
+        return (int(games), int(wins))
+
+    def close(self) -> None:
+        """Detach from the shared memory, and free it if this process created it. Any shared lookups stop working."""
+        self.values.release()
+        self.memory.close()
+        if self.owner: self.memory.unlink()
+
+def _sharedTrainingWorker(name: str, spec: tuple, worker: int, gameCount: int, learnFactor: float, batchSize: int, seed: int, rows: int = 3, columns: int = 3) -> None:
+    """Trains on a `SharedPolicy` in a separate process. Used by `sharedSelfTrain()`."""
+    seedRandom(None if seed == None else seed+worker)
+    policy = SharedPolicy(name=name, spec=spec)
+    ai = ComputerPlayer(learnFactor, batchSize=batchSize, rows=rows, columns=columns)
+    ai.useLayouts(policy.sharedLookup())
+    masterAI = MasterPlayer(rows, columns)
+    cache = PositionCache(preload=True, rows=rows, columns=columns)
+    wins = 0
+    for i in range(gameCount):
+        layout = cache.start
+        masterTurn = True
+        position = cache.lookup(layout, True)
+        while not position[0]:
+            if masterTurn: moveData = masterAI.pickMove(layout)
+            else:
+                try: moveData = ai.pickMove(layout)
+                except TypeError:
+                    # Another process's update was lost, so this layout's probabilities no longer add up to 1.
+                    moves = ai.layoutLookup[layout]
+                    total = sum(move[1] for move in moves)
+                    for move in moves: move[1] = move[1]/total if total > 0 else 1/len(moves)
+                    moveData = ai.pickMove(layout)
+                ai.archiveMove(layout, moveData[3])
+            masterTurn = not masterTurn
+            layout = cache.successor(layout, position, moveData)
+            position = cache.lookup(layout, masterTurn)
+        if masterTurn: wins += 1
+        ai.learnFromGame(masterTurn)
+        if (i+1) % 100 == 0: policy.recordGames(worker, i+1, wins)
+    ai.applyBatch()
+    policy.recordGames(worker, gameCount, wins)
+    ai.layoutLookup = {}
+    policy.close()
+
+def sharedSelfTrain(ai: ComputerPlayer, workers: int = 4, gamesPerWorker: int = 10000, checkpointInterval: float = 5.0, checkpointName: str = None, exportName: str = None, showProgress: bool = True, seed: int = None) -> tuple:
+    """
+    Trains an AI with several processes at once, all updating one `SharedPolicy` in place.
+
+    `workers` - Number of training processes.
+
+    `gamesPerWorker` - Number of games each process plays.
+
+    `checkpointInterval` - Seconds between progress checks. The benchmark score is recorded at every check.
+
+    `checkpointName` - When given, the AI is also saved to this ".hexai" file at every check.
+
+    `exportName` - When given, the AI is saved to this ".hexai" file once training is done.
+
+    The AI's learn factor and batch size are used by every process. Once done, the AI holds the trained probabilities and its game and win counts are updated.
+
+    On boards other than 3-by-3, the moves of every layout the AI can reach are generated before training starts, since only layouts that exist can be shared. Every process also works out every position, so this gets slow quickly as the board grows.
+
+    Returns the number of wins and the time taken, like `virtualiseGames()`.
+    """
+    if gamesPerWorker <= 0: raise ValueError("Argument gamesPerWorker must be a positive integer above 0.")
+    if ai.applyBatch(): ai.benchmark()
+    if isinstance(ai.layoutLookup, GeneratedLayouts):
+        cache = PositionCache(preload=True, rows=ai.rows, columns=ai.columns)
+        for layout, position in cache.positions[False].items():
+            if not position[0]: ai.layoutLookup[layout]
+    policy = SharedPolicy(ai, workers)
+    plainLookup = ai.layoutLookup
+    gameCount, winCount = (ai.gameCount, ai.winCount)
     t = perf_counter()
+    processes = [Process(target=_sharedTrainingWorker, args=(policy.name, policy.spec, i, gamesPerWorker, ai.learnFactor, ai.batchSize, seed, ai.rows, ai.columns)) for i in range(workers)]
+    try:
+        for process in processes: process.start()
+        ai.layoutLookup = policy.sharedLookup()
+        while any(process.is_alive() for process in processes):
+            for process in processes: process.join(checkpointInterval/workers)
+            games, wins = policy.totals()
+            ai.gameCount, ai.winCount = (gameCount+games, winCount+wins)
+            ai.benchmark()
+            if showProgress: print(f"{games} of {workers*gamesPerWorker} games played, {wins} won. Benchmark: {ai.benchmarkScore}")
+            if checkpointName != None:
+                ai.layoutLookup = policy.toLayoutLookup()
+                ai.exportAI(checkpointName)
+                ai.layoutLookup = policy.sharedLookup()
+        for process in processes:
+            if process.exitcode != 0: raise RuntimeError(f"Training process {processes.index(process)} stopped with exit code {process.exitcode}.")
+        games, wins = policy.totals()
+        ai.useLayouts(policy.toLayoutLookup())
+    except BaseException:
+        for process in processes:
+            if process.is_alive(): process.terminate()
+        ai.layoutLookup = plainLookup
+        ai.gameCount, ai.winCount = (gameCount, winCount)
+        raise
+    finally: policy.close()
+    ai.gameCount, ai.winCount = (gameCount+games, winCount+wins)
+    ai.benchmark()
+    if exportName != None: ai.exportAI(exportName)
+    return (wins, perf_counter() - t)
+
+def _trainSweepConfiguration(task: tuple) -> dict:
+    """Trains and scores one learn factor and seed. Used as a process pool worker by `sweepLearnFactor()`."""
+    learnFactor, seed, gameCount, targetScore, resultFile, modelFile = task
+    seedRandom(seed)
+    ai = ComputerPlayer(learnFactor)
+    wins, time = virtualiseGames(ai, gameCount, True)
+    gamesToTarget = None
+    for i in range(len(ai.benchmarkArchive)):
+        if ai.benchmarkArchive[i] >= targetScore:
+            gamesToTarget = i+1
+            break
+    result = {
+        "learnFactor": learnFactor,
+        "seed": seed,
+        "games": gameCount,
+        "games_to_target": gamesToTarget,
+        "training_wins": wins,
+        "benchmark": ai.benchmarkScore,
+        "win_rate": exactWinProbability(ai)[0],
+        "time": time,
+        "model": path.basename(modelFile)
+    }
+    ai.exportAI(modelFile)
+    with open(resultFile+".tmp", "w") as file:
+        file.write(dumps(result))
+    replace(resultFile+".tmp", resultFile)
+    return result
+
+def sweepLearnFactor(learnFactors: list = (0.001, 0.003, 0.01, 0.03, 0.1, 0.3), seeds: list = (0, 1, 2), randomSearch: int = 0, factorRange: tuple = (0.001, 0.5), gameCount: int = 5000, targetScore: int = 6000, processes: int = None, cacheDirectory: str = "learn-factor-sweep", exportBest: str = None, showTable: bool = True) -> list:
+    """
+    Trains a new AI for every combination of learn factor and seed in parallel, to find the best learn factor.
+
+    `learnFactors` - The learn factors to try.
+
+    `randomSearch` - When above 0, this many learn factors are picked at random from `factorRange` (evenly on a log scale) instead.
+
+    `gameCount` - Number of training games for each AI.
+
+    `targetScore` - Each AI records how many games it took to first reach this benchmark score.
+
+    `cacheDirectory` - Where each finished AI and its results are kept. Finished combinations are not trained again, so an interrupted sweep can be resumed by running it again.
+
+    `exportBest` - When given, the AI with the highest win rate from the best learn factor is saved to this ".hexai" file.
+
+    Returns a list of dictionaries summarising each learn factor, best first. The win rate is the exact chance of beating the Master Player after training, averaged across seeds.
+    """
+    if gameCount <= 0: raise ValueError("Argument gameCount must be a positive integer above 0.")
+    if randomSearch > 0:
+        generator = Random(randomSearch)
+        learnFactors = sorted(exp(generator.uniform(log(factorRange[0]), log(factorRange[1]))) for i in range(randomSearch))
+    makedirs(cacheDirectory, exist_ok=True)
+    results = []
+    tasks = []
+    for learnFactor in learnFactors:
+        for seed in seeds:
+            name = f"lf-{learnFactor!r}-seed-{seed}-games-{gameCount}-target-{targetScore}"
+            resultFile = path.join(cacheDirectory, name+".json")
+            if path.exists(resultFile):
+                with open(resultFile, 'r') as file:
+                    results.append(loads(file.read()))
+            else: tasks.append((learnFactor, seed, gameCount, targetScore, resultFile, path.join(cacheDirectory, name+".hexai")))
+    if len(tasks) > 0:
+        with ProcessPoolExecutor(processes) as pool:
+            results.extend(pool.map(_trainSweepConfiguration, tasks))
+
+    summary = []
+    for learnFactor in learnFactors:
+        runs = [result for result in results if result["learnFactor"] == learnFactor]
+        reached = [result["games_to_target"] for result in runs if result["games_to_target"] != None]
+        summary.append({
+            "learnFactor": learnFactor,
+            "runs": len(runs),
+            "reached_target": len(reached),
+            "games_to_target": sum(reached)/len(reached) if len(reached) > 0 else None,
+            "win_rate": sum(result["win_rate"] for result in runs)/len(runs),
+            "best_model": max(runs, key=lambda result: result["win_rate"])["model"]
+        })
+    summary.sort(key=lambda row: (-round(row["win_rate"], 4), float("inf") if row["games_to_target"] == None else row["games_to_target"]))
+
+    if showTable:
+        print(f"{'Learn Factor':<14}{'Reached Target':>16}{'Games to Target':>17}{'Win Rate':>10}")
+        for row in summary:
+            reached = f"{row['reached_target']}/{row['runs']}"
+            gamesToTarget = "-" if row["games_to_target"] == None else round(row["games_to_target"])
+            print(f"{row['learnFactor']:<14.5g}{reached:>16}{gamesToTarget:>17}{round(row['win_rate']*100, 2):>9} %")
+    if exportBest != None and len(summary) > 0:
+        ComputerPlayer(fileSource=path.join(cacheDirectory, summary[0]["best_model"])).exportAI(exportBest)
+    return summary
+
+class GameServer():
+    """
+    Hosts many concurrent games against one shared AI, over a line-based JSON protocol.
+
+    `ai` - The AI that every session plays against.
+
+    `learn` - Whether the AI learns from finished games.
+
+    Each request is one JSON object per line, and gets one JSON object per line in response:
+
+    `{"action": "new"}` - Starts a game. Responds with `session`, `board` and the player's legal `moves`.
+
+    `{"action": "move", "session": id, "move": "A3>A2"}` - Plays a move for White. Responds with the AI's reply `ai_move`, the new `board`, the player's legal `moves` and the `result` ("player", "cpu" or `null` while the game continues).
+
+    `{"action": "quit", "session": id}` - Abandons a game without learning from it.
 
+    A session is only stored as its board layout string and the AI's moves so far. Finished games are queued and applied to the AI by a single writer task, so learning never interleaves with another update.
+    """
+    def __init__(self, ai: ComputerPlayer, learn: bool = True) -> None:
+        self.ai = ai
+        self.learn = learn
+        self.sessions = {}
+        self.nextSession = 1
+        self.gamesFinished = 0
+        self.board = hexBoard(ai.rows, ai.columns)
+        self.start = self.board.returnCaptureString()
+        self.learnQueue = None
+
+    def newGame(self) -> dict:
+        """Start a new session."""
+        session = self.nextSession
+        self.nextSession += 1
+        layout = self.start
+        self.sessions[session] = [layout, []]
+        self.board.loadCaptureString(layout)
+        return {"session": session, "board": layout, "moves": self.board.listMoves(WhitePawn)}
+
+    def __finish(self, session: int, AIWin: bool) -> None:
+        archive = self.sessions.pop(session)[1]
+        self.gamesFinished += 1
+        if self.learn: self.learnQueue.put_nowait((archive, AIWin))
+
+    def playMove(self, session: int, move: str) -> dict:
+        """Play a move for the player in a session, then the AI's reply."""
+        state = self.sessions.get(session)
+        if state == None: return {"error": f"Unknown session {session}."}
+        board = self.board
+        board.loadCaptureString(state[0])
+        if not move in board.listMoves(WhitePawn): return {"error": f"{move} is not a legal move.", "session": session}
+        source, target = move.split(">")
+        sourceSpace = returnCoords(source)
+        targetSpace = returnCoords(target)
+        board.overwriteAndMove(sourceSpace[0], sourceSpace[1], targetSpace[0], targetSpace[1])
+        if checkEndGame(board, False):
+            self.__finish(session, False)
+            return {"session": session, "board": board.returnCaptureString(), "ai_move": None, "moves": [], "result": "player"}
+        layout = board.returnCaptureString()
+        moveData = self.ai.pickMove(layout)
+        state[1].append((layout, moveData[3]))
+        self.ai.applyMove(layout, moveData, board)
+        state[0] = board.returnCaptureString()
+        if checkEndGame(board, True):
+            self.__finish(session, True)
+            return {"session": session, "board": state[0], "ai_move": f"{moveData[0]}>{moveData[1]}", "moves": [], "result": "cpu"}
+        return {"session": session, "board": state[0], "ai_move": f"{moveData[0]}>{moveData[1]}", "moves": board.listMoves(WhitePawn), "result": None}
+
+    def handleRequest(self, request: dict, owned: set = None) -> dict:
+        """
+        Respond to one decoded request.
+
+        `owned` - The sessions started by the connection the request came from. When given, only those sessions can be played or quit, and new and finished sessions are added to and removed from it.
+        """
+        action = request.get("action")
+        if action == "new":
+            response = self.newGame()
+            if owned != None: owned.add(response["session"])
+            return response
+        if not action in ("move", "quit"): return {"error": f"Unknown action {action}."}
+        session = request.get("session")
+        if type(session) is not int: return {"error": "Request session must be an integer."}
+        if owned != None and not session in owned: return {"error": f"Unknown session {session}."}
+        if action == "move":
+            move = request.get("move")
+            if type(move) is not str: return {"error": "Request move must be a string.", "session": session}
+            try: response = self.playMove(session, move)
+            except (KeyError, RuntimeError) as error: return {"error": f"AI could not move: {error}", "session": session}
+            if owned != None and response.get("result") != None: owned.discard(session)
+            return response
+        self.sessions.pop(session, None)
+        if owned != None: owned.discard(session)
+        return {"session": session, "result": None}
+
+    async def handleConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests from one client until it disconnects. A client can have any number of sessions, which are abandoned when it disconnects."""
+        owned = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                try: request = loads(line)
+                except ValueError: response = {"error": "Request is not valid JSON."}
+                else:
+                    if type(request) is dict: response = self.handleRequest(request, owned)
+                    else: response = {"error": "Request must be a JSON object."}
+                writer.write(dumps(response).encode()+b"\n")
+                await writer.drain()
+        except ConnectionError: pass
+        finally:
+            for session in owned: self.sessions.pop(session, None)
+            writer.close()
+
+    async def learnFromQueue(self) -> None:
+        """The single writer task, which applies finished games to the AI in order."""
+        while True:
+            archive, AIWin = await self.learnQueue.get()
+            self.ai.moveArchive = archive
+            if self.ai.learnFromGame(AIWin): self.ai.benchmark()
+            self.learnQueue.task_done()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, unixPath: str = None) -> None:
+        """Serve games until cancelled. A Unix socket is used instead of TCP when `unixPath` is given."""
+        self.learnQueue = asyncio.Queue()
+        learner = asyncio.create_task(self.learnFromQueue())
+        if unixPath != None: server = await asyncio.start_unix_server(self.handleConnection, unixPath)
+        else: server = await asyncio.start_server(self.handleConnection, host, port)
+        try:
+            async with server: await server.serve_forever()
+        finally:
+            await self.learnQueue.join()
+            learner.cancel()
+
+def serveGames(ai: ComputerPlayer, host: str = "127.0.0.1", port: int = 8765, unixPath: str = None, learn: bool = True) -> None:
+    """Runs a `GameServer` for the given AI until interrupted with Ctrl+C."""
+    server = GameServer(ai, learn)
+    print(f"Serving games on {unixPath if unixPath != None else f'{host}:{port}'}. Press Ctrl+C to stop.")
+    try: asyncio.run(server.serve(host, port, unixPath))
+    except KeyboardInterrupt: pass
+    if ai.applyBatch(): ai.benchmark()
+    print(f"Server stopped after {server.gamesFinished} finished games.")
+
+async def _loadTestClient(host: str, port: int, unixPath: str, gameCount: int, latencies: list) -> int:
+    """Plays games with random legal moves over one connection, recording the latency of every request."""
+    if unixPath != None: reader, writer = await asyncio.open_unix_connection(unixPath)
+    else: reader, writer = await asyncio.open_connection(host, port)
+    async def request(data: dict) -> dict:
+        t = perf_counter()
+        writer.write(dumps(data).encode()+b"\n")
+        await writer.drain()
+        response = loads(await reader.readline())
+        latencies.append(perf_counter() - t)
+        return response
+    finished = 0
     for i in range(gameCount):
-        if logWithName != None: log += f"----- Game {i+1} of {gameCount} -----\n"
-        won, gameLog = autoGame(board, ai, masterAI, train, showCommentary, (logWithName != None))
-        if won: wins += 1
-        if logWithName != None: log += gameLog
-        board = hexBoard()
+        response = await request({"action": "new"})
+        session = response["session"]
+        while len(response.get("moves", [])) > 0:
+            response = await request({"action": "move", "session": session, "move": choice(response["moves"])})
+        if response.get("result") != None: finished += 1
+    writer.close()
+    return finished
+
+def loadTestServer(host: str = "127.0.0.1", port: int = 8765, unixPath: str = None, clients: int = 100, gamesPerClient: int = 10) -> dict:
+    """
+    Connects many simulated players to a running `GameServer` and reports request latency percentiles.
 
-    if logWithName != None:
-        with open(logWithName, "a") as file:
-            file.write(log)
+    `clients` - Number of concurrent connections.
 
+    `gamesPerClient` - Number of games each connection plays, one after another.
+    """
+    latencies = []
+    async def run() -> list:
+        return await asyncio.gather(*[_loadTestClient(host, port, unixPath, gamesPerClient, latencies) for i in range(clients)])
+    t = perf_counter()
+    finished = sum(asyncio.run(run()))
     time = perf_counter() - t
-    return (wins, time)
-
-def initialiseUI():
-    """Starts the GUI Application."""
+    latencies.sort()
+    def percentile(p: float) -> float: return latencies[min(len(latencies)-1, int(len(latencies)*p))]*1000
+    report = {
+        "games": finished,
+        "requests": len(latencies),
+        "time": time,
+        "requests_per_second": len(latencies)/time,
+        "p50_ms": percentile(0.5),
+        "p90_ms": percentile(0.9),
+        "p99_ms": percentile(0.99),
+        "max_ms": latencies[-1]*1000
+    }
+    print(f"{finished} games, {len(latencies)} requests in {round(time, 2)}s ({round(report['requests_per_second'])}/s)")
+    print(f"Latency p50 {report['p50_ms']:.2f}ms, p90 {report['p90_ms']:.2f}ms, p99 {report['p99_ms']:.2f}ms, max {report['max_ms']:.2f}ms")
+    return report
+
+def initialiseUI(fileSource: str = None):
+    """Starts the GUI Application, optionally loading the AI from a ".hexai" file."""
     boardData = hexBoard()
-    ai = ComputerPlayer()
+    ai = ComputerPlayer(fileSource=fileSource)
 
     def noCommandYet() -> None:
         print("This button's subroutine has not been implemented yet!")
@@ -739,10 +3513,10 @@ def initialiseUI():
     def moveSpace(target) -> None:
         sX, sY = returnCoords(sourceSpace.get())
         tX, tY = returnCoords(target)
-        boardData.overwriteAndMove(sX, sY, tX, tY)
+        boardData.makeMove(sX, sY, tX, tY)
         updateGUIBoard()
         post(f"Player: {sourceSpace.get()} -> {target}")
-        if checkEndGame(boardData):
+        if checkEndGame(boardData, False):
             post("Player Wins\n")
             lockBoard()
             if learningBool.get(): ai.learnFromGame(False)
@@ -754,7 +3528,7 @@ def initialiseUI():
             handleAIMove(aiMove, boardData)
             updateGUIBoard()
             post(f"   CPU: {aiS} -> {aiT}")
-            if checkEndGame(boardData):
+            if checkEndGame(boardData, True):
                 post("CPU Wins\n")
                 lockBoard()
                 if learningBool.get(): ai.learnFromGame(True)
@@ -879,6 +3653,17 @@ def initialiseUI():
     def resetBoard() -> None:
         boardData.reset()
         updateGUIBoard()
+
+    def undoMove() -> None:
+        if boardData.movesMade == 0: post("[!] There are no moves to undo.")
+        elif checkEndGame(boardData, True): post("[!] The game is over. Press RESET to play again.")
+        else:
+            # The CPU always replies straight away, so take back its move and the player's move before it.
+            boardData.unmakeMove()
+            if len(ai.moveArchive) > 0: ai.moveArchive.pop()
+            boardData.unmakeMove()
+            updateGUIBoard()
+            post("Last move undone.")
     
     def toggleLearn() -> None:
         if learningBool.get():
@@ -916,7 +3701,7 @@ def initialiseUI():
     def openTrainMenu() -> None:
         branch = Tk()
         branch.title("Training Menu")
-        branch.geometry("250x350")
+        branch.geometry("250x390")
 
         subWin = Frame(branch)
         subWin.pack(fill=BOTH, expand=1)
@@ -924,6 +3709,9 @@ def initialiseUI():
         save = BooleanVar()
         save.set(False)
         def invertSave(): save.set(not save.get())
+        earlyStop = BooleanVar()
+        earlyStop.set(False)
+        def invertEarlyStop(): earlyStop.set(not earlyStop.get())
         summary = BooleanVar()
         summary.set(False)
         def invertSummary(): summary.set(not summary.get())
@@ -936,6 +3724,9 @@ def initialiseUI():
         log = BooleanVar()
         log.set(False)
         def invertLog(): log.set(not log.get())
+        metrics = BooleanVar()
+        metrics.set(False)
+        def invertMetrics(): metrics.set(not metrics.get())
 
         def startTraining() -> None:
             gameQuantityData = gameQuantityEntry.get()
@@ -947,7 +3738,8 @@ def initialiseUI():
             else:
                 startButton.config(text="Training...")
                 startButton.config(state=DISABLED)
-                closeButton.config(state=DISABLED)
+                control = PauseControl(strftime("Paused Training %d-%m-%Y %H-%M-%S.hexresume"), onCheck=branch.update)
+                closeButton.config(text="Pause", command=control.pause)
 
                 saveVal = save.get()
                 summaryVal = summary.get()
@@ -957,25 +3749,31 @@ def initialiseUI():
 
                 if logVal: logName = strftime("Training Log %d-%m-%Y %H-%M-%S.hexlog")
                 else: logName = None
-                virtualiseGames(ai, games, True, commentaryVal, logName)
+                monitor = ConvergenceMonitor() if earlyStop.get() else None
+                liveMetrics = TrainingMetrics() if metrics.get() else None
+                virtualiseGames(ai, games, True, commentaryVal, logName, monitor, liveMetrics, control=control)
+                if control.paused: post(f"[*] Training paused, saved to \"{control.resumeFile}\".\n")
+                if monitor != None and monitor.reason != None: post(f"[*] {monitor.reason}, stopped after {monitor.gamesPlayed} of {games} games.\n")
                 if saveVal: saveAI()
                 if benchmarkVal: ai.plotBenchmarkHistory()
 
                 branch.destroy()
 
         xOff, yOff = (10,10)
-        buttonFooterX, buttonFooterY = (12,250)
+        buttonFooterX, buttonFooterY = (12,290)
 
         gameQuantityLabel = Label(subWin, text="No. of Games")
         gameQuantityEntry = Entry(subWin)
 
         configSave = Checkbutton(subWin, text="Save AI when done", variable=save, command=invertSave)
+        configEarlyStop = Checkbutton(subWin, text="Stop early when AI stops improving", variable=earlyStop, command=invertEarlyStop)
         dataConfigLabel = Label(subWin, text="Data Options")
         configSummary = Checkbutton(subWin, text="Open Summary when Done", variable=summary, command=invertSummary)
         configBenchmark = Checkbutton(subWin, text="Show Benchmark Progression*", variable=benchmark, command=invertBenchmark)
         logConfigLabel = Label(subWin, text="Logging Options")
         configCommentary = Checkbutton(subWin, text="Output Game info to Console", variable=commentary, command=invertCommentary)
         configLog = Checkbutton(subWin, text="Create training log (.hexlog)", variable=log, command=invertLog)
+        configMetrics = Checkbutton(subWin, text="Write live metrics (.prom)", variable=metrics, command=invertMetrics)
         noticeLabel = Label(subWin, text="*Matplotlib and Numpy required", fg="#888", font=("Calibri", 8))
 
         startButton = Button(subWin, text="START", width=18, height=1, font=("Calibri", 18), command=startTraining)
@@ -984,13 +3782,15 @@ def initialiseUI():
         gameQuantityLabel.place(x=xOff, y=yOff)
         gameQuantityEntry.place(x=xOff, y=yOff+20)
         configSave.place(x=xOff, y=yOff+50)
-        dataConfigLabel.place(x=xOff, y=yOff+80)
-        configSummary.place(x=xOff, y=yOff+100)
-        configBenchmark.place(x=xOff, y=yOff+120)
-        logConfigLabel.place(x=xOff, y=yOff+150)
-        configCommentary.place(x=xOff, y=yOff+170)
-        configLog.place(x=xOff, y=yOff+190)
-        noticeLabel.place(x=xOff, y=yOff+215)
+        configEarlyStop.place(x=xOff, y=yOff+70)
+        dataConfigLabel.place(x=xOff, y=yOff+100)
+        configSummary.place(x=xOff, y=yOff+120)
+        configBenchmark.place(x=xOff, y=yOff+140)
+        logConfigLabel.place(x=xOff, y=yOff+170)
+        configCommentary.place(x=xOff, y=yOff+190)
+        configLog.place(x=xOff, y=yOff+210)
+        configMetrics.place(x=xOff, y=yOff+230)
+        noticeLabel.place(x=xOff, y=yOff+255)
         startButton.place(x=buttonFooterX,y=buttonFooterY)
         closeButton.place(x=buttonFooterX,y=buttonFooterY+60)
 
@@ -1001,7 +3801,7 @@ def initialiseUI():
     def openTestMenu() -> None:
         branch = Tk()
         branch.title("Test Menu")
-        branch.geometry("250x235")
+        branch.geometry("250x275")
 
         subWin = Frame(branch)
         subWin.pack(fill=BOTH, expand=1)
@@ -1015,8 +3815,22 @@ def initialiseUI():
         log = BooleanVar()
         log.set(False)
         def invertLog(): log.set(not log.get())
+        exact = BooleanVar()
+        exact.set(False)
+        def invertExact(): exact.set(not exact.get())
+        settle = BooleanVar()
+        settle.set(False)
+        def invertSettle(): settle.set(not settle.get())
 
         def startTesting() -> None:
+            if exact.get():
+                chance, openings = exactWinProbability(ai)
+                post(f"[*] Exact win chance: {round(chance*100, 2)} %")
+                for move, openingChance in openings.items():
+                    post(f"    After {move}: {round(openingChance*100, 2)} %")
+                post("")
+                branch.destroy()
+                return
             gameQuantityData = gameQuantityEntry.get()
             try:
                 games = int(gameQuantityData)
@@ -1026,20 +3840,27 @@ def initialiseUI():
             else:
                 startButton.config(text="Testing...")
                 startButton.config(state=DISABLED)
-                closeButton.config(state=DISABLED)
+                control = PauseControl(strftime("Paused Test %d-%m-%Y %H-%M-%S.hexresume"), onCheck=branch.update)
+                closeButton.config(text="Pause", command=control.pause)
 
                 commentaryVal = commentary.get()
                 logVal = log.get()
 
                 if logVal: logName = strftime("Test Log %d-%m-%Y %H-%M-%S.hexlog")
                 else: logName = None
-                virtualiseGames(ai, games, False, commentaryVal, logName)
-                ai.plotWinsOverGames()
+                monitor = SequentialTest(width=0.02) if settle.get() else None
+                virtualiseGames(ai, games, False, commentaryVal, logName, monitor, control=control)
+                if control.paused: post(f"[*] Testing paused, saved to \"{control.resumeFile}\".\n")
+                else:
+                    if monitor != None:
+                        if monitor.reason != None: post(f"[*] {monitor.reason}, stopped after {monitor.gamesPlayed} of {games} games.")
+                        post(f"[*] Win rate {round(monitor.winRate*100, 2)} %, 95 % interval {round(monitor.interval[0]*100, 2)} - {round(monitor.interval[1]*100, 2)} %.\n")
+                    ai.plotWinsOverGames()
 
                 branch.destroy()
 
         xOff, yOff = (10,10)
-        buttonFooterX, buttonFooterY = (12,135)
+        buttonFooterX, buttonFooterY = (12,175)
 
         gameQuantityLabel = Label(subWin, text="No. of Games")
         gameQuantityEntry = Entry(subWin)
@@ -1047,6 +3868,8 @@ def initialiseUI():
         logConfigLabel = Label(subWin, text="Logging Options")
         configCommentary = Checkbutton(subWin, text="Output Game info to Console", variable=commentary, command=invertCommentary)
         configLog = Checkbutton(subWin, text="Create testing log (.hexlog)", variable=log, command=invertLog)
+        configExact = Checkbutton(subWin, text="Calculate exact win chance instead", variable=exact, command=invertExact)
+        configSettle = Checkbutton(subWin, text="Stop once win rate is known to ±1 %", variable=settle, command=invertSettle)
 
         startButton = Button(subWin, text="START", width=18, height=1, font=("Calibri", 18), command=startTesting)
         closeButton = Button(subWin, text="Close", width=27, font=("Calibri", 12), command=branch.destroy)
@@ -1056,6 +3879,8 @@ def initialiseUI():
         logConfigLabel.place(x=xOff, y=yOff+50)
         configCommentary.place(x=xOff, y=yOff+70)
         configLog.place(x=xOff, y=yOff+90)
+        configExact.place(x=xOff, y=yOff+110)
+        configSettle.place(x=xOff, y=yOff+130)
         startButton.place(x=buttonFooterX,y=buttonFooterY)
         closeButton.place(x=buttonFooterX,y=buttonFooterY+60)
 
@@ -1085,6 +3910,59 @@ def initialiseUI():
 
         branch.mainloop()
 
+    def openCompare() -> None:
+        files = filedialog.askopenfilenames(title="Select .hexai files to compare", filetypes=[("Hexapywn AI", "*.hexai")])
+        if len(files) == 0: return
+        try: rows = compareModels(list(files), showTable=False)
+        except (OSError, KeyError, ValueError):
+            post("[!] Error while reading models\n")
+            return
+
+        branch = Tk()
+        branch.title("Compare AI")
+        branch.geometry("520x320")
+
+        subWin = Frame(branch)
+        subWin.pack(fill=BOTH, expand=1)
+
+        def loadSelected() -> None:
+            selection = modelList.curselection()
+            if len(selection) == 0: return
+            row = rows[selection[0]]
+            try: ai.importAI(row["file"])
+            except (OSError, KeyError, ValueError, RuntimeError): post(f"[!] Could not load {row['name']}\n")
+            else: post(f"[*] AI loaded from {row['name']}.\n")
+
+        def chartModels() -> None: plotModelComparison(rows)
+
+        Label(subWin, text=f"{'Model':<24} {'Games':>8} {'Win %':>7} {'Score':>7} {'Peak':>7}", font=("Courier", 9)).pack(anchor=W, padx=10, pady=(10,0))
+        modelList = Listbox(subWin, width=70, height=12, font=("Courier", 9))
+        for row in rows:
+            modelList.insert(END, f"{row['name'][:24]:<24} {row['games']:>8} {round(row['win_rate']*100, 2):>7} {row['benchmark']:>7} {row['peak']:>7}")
+        modelList.pack(padx=10)
+        buttons = Frame(subWin)
+        buttons.pack(pady=10)
+        chartButton = Button(buttons, text="Chart", width=12, font=("Calibri", 12), command=chartModels)
+        chartButton.pack(side=LEFT, padx=5)
+        Button(buttons, text="Load Selected", width=12, font=("Calibri", 12), command=loadSelected).pack(side=LEFT, padx=5)
+        Button(buttons, text="Close", width=12, font=("Calibri", 12), command=branch.destroy).pack(side=LEFT, padx=5)
+
+        if not chartsAvailable: chartButton.config(state=DISABLED)
+
+        branch.mainloop()
+
+    def openLogSummary() -> None:
+        files = filedialog.askopenfilenames(title="Select logs or a log summary", filetypes=[("Log Summary", "*.npz"), ("Hexapywn Logs", "*.hexlog *.log *.gz *.bz2 *.xz"), ("All Files", "*.*")])
+        if len(files) == 0: return
+        try:
+            if len(files) == 1 and files[0].endswith(".npz"): summary = loadLogSummary(files[0])
+            else: summary = analyseLogs(list(files), processes=1, summaryFile=path.join(path.dirname(files[0]), "log-summary.npz"))
+        except (OSError, KeyError, ValueError):
+            post("[!] Error while reading logs\n")
+            return
+        post(f"[*] {summary.games} games, AI won {round(summary.wins/max(summary.games, 1)*100, 2)} %.\n")
+        summary.plot()
+
     def editLearnFactor() -> None:
         branch = Tk()
         branch.title("Change Learn Factor")
@@ -1116,6 +3994,40 @@ def initialiseUI():
         closeButton.place(x=225, y=115)
 
         branch.mainloop()
+
+    def editBatchSize() -> None:
+        branch = Tk()
+        branch.title("Change Batch Size")
+        branch.geometry("300x150")
+
+        subWin = Frame(branch)
+        subWin.pack(fill=BOTH, expand=1)
+
+        def changeBatchSize() -> None:
+            data = numberEntry.get()
+            try:
+                newSize = int(data)
+                if newSize <= 0: raise ValueError()
+            except ValueError:
+                numberEntry.config(bg="#faa", fg="#000")
+            else:
+                if ai.applyBatch(): ai.benchmark()
+                ai.batchSize = newSize
+                branch.destroy()
+
+        title = Label(subWin, text="Learn from games in batches of:")
+        title.pack(pady=10)
+        numberEntry = Entry(subWin)
+        numberEntry.insert(0, str(ai.batchSize))
+        numberEntry.pack()
+        notice = Label(subWin, text="(1 learns after every game)", font=("Calibri", 8))
+        notice.pack(pady=10)
+        enterButton = Button(subWin, text="Confirm", width=8, command=changeBatchSize)
+        enterButton.place(x=150, y=115)
+        closeButton = Button(subWin, text="Cancel", width=8, command=branch.destroy)
+        closeButton.place(x=225, y=115)
+
+        branch.mainloop()
     
     def changeInterface() -> None:
         root.withdraw()
@@ -1139,6 +4051,8 @@ def initialiseUI():
             win.config(bg=bgColorEntry.get())
             resetButton.config(bg=bgColorEntry.get())
             resetButton.config(fg=textColorEntry.get())
+            undoButton.config(bg=bgColorEntry.get())
+            undoButton.config(fg=textColorEntry.get())
             learnButton.config(bg=bgColorEntry.get())
             learnButton.config(fg=textColorEntry.get())
         
@@ -1179,6 +4093,42 @@ def initialiseUI():
 
         branch.mainloop()
 
+    def openTournament() -> None:
+        directory = filedialog.askdirectory(title="Select a folder of .hexai files")
+        if directory == "": return
+        post("[*] Running tournament...")
+        try: table = runTournament(directory, showTable=False)
+        except (OSError, KeyError, ValueError, RuntimeError):
+            post("[!] Error while running tournament\n")
+            return
+        for row in table:
+            post(f"{row['name'][:16]:<16} {round(row['rating']):>5} ±{round((row['high']-row['low'])/2)}")
+        post("")
+
+    def resumeRun() -> None:
+        filename = filedialog.askopenfilename(defaultextension=".hexresume", filetypes=[("Paused Hexapywn Run", "*.hexresume")])
+        if filename == "": return
+        branch = Tk()
+        branch.title("Resuming")
+        branch.geometry("250x110")
+
+        subWin = Frame(branch)
+        subWin.pack(fill=BOTH, expand=1)
+
+        Label(subWin, text="Resuming paused games...").pack(pady=10)
+        control = PauseControl(filename, onCheck=branch.update)
+        pauseButton = Button(subWin, text="Pause", width=27, font=("Calibri", 12), command=control.pause)
+        pauseButton.pack()
+        branch.update()
+
+        try: wins = resumeGames(filename, ai, control)[1]
+        except (OSError, KeyError, ValueError, RuntimeError):
+            post("[!] Could not resume this run.\n")
+        else:
+            if control.paused: post(f"[*] Paused again, saved to \"{filename}\".\n")
+            else: post(f"[*] Resumed run finished with {wins} wins.\n")
+        branch.destroy()
+
     def saveAI() -> None:
         filename = filedialog.asksaveasfilename(defaultextension=".hexai", filetypes=[("Hexapywn AI", "*.hexai")])
         try: ai.exportAI(filename)
@@ -1190,6 +4140,8 @@ def initialiseUI():
         try: ai.importAI(filename)
         except FileNotFoundError:
             if filename != "": post("[!] File not Found!\n")
+        except RuntimeError: post("[!] File contains an illegal move!\n")
+        except ValueError as error: post(f"[!] {error}\n")
         else: post("[*] AI loaded from file.\n")
 
     root = Tk()
@@ -1207,6 +4159,7 @@ def initialiseUI():
     fileMenu.add_command(label="Save AI as...", command=saveAI)
     fileMenu.add_command(label="Import Data...", command=loadAI)
     fileMenu.add_command(label="Reset Current", command=confirmReset)
+    fileMenu.add_command(label="Resume Paused Run...", command=resumeRun)
     fileMenu.add_separator()
     fileMenu.add_command(label="Clear Text Pane", command=clearTextPane)
     fileMenu.add_separator()
@@ -1216,12 +4169,17 @@ def initialiseUI():
     menu.add_cascade(label='Configure', menu=trainMenu)
     trainMenu.add_command(label="Train AI", command=openTrainMenu)
     trainMenu.add_command(label="Benchmark AI", command=openBenchmark)
+    trainMenu.add_command(label="Compare AI...", command=openCompare)
     trainMenu.add_command(label="Test AI", command=openTestMenu)
+    trainMenu.add_command(label="Chart Logs...", command=openLogSummary)
+    if not chartsAvailable: trainMenu.entryconfig("Chart Logs...", state=DISABLED)
 
     advancedMenu = Menu(menu)
     menu.add_cascade(label='Advanced', menu=advancedMenu)
     advancedMenu.add_command(label='Adjust Learn Factor', command=editLearnFactor)
+    advancedMenu.add_command(label='Adjust Batch Size', command=editBatchSize)
     advancedMenu.add_command(label='Switch to Console Mode', command=changeInterface)
+    advancedMenu.add_command(label='Run Tournament...', command=openTournament)
     advancedMenu.add_separator()
     advancedMenu.add_command(label='UI Preferences', command=openCustomiseMenu)
 
@@ -1269,6 +4227,9 @@ def initialiseUI():
     resetButton = Button(win, text='RESET', width=9, font=("Calibri", 14), command=resetBoard)
     resetButton.place(x=265, y=350)
 
+    undoButton = Button(win, text='UNDO', width=9, font=("Calibri", 14), command=undoMove)
+    undoButton.place(x=372, y=350)
+
     learnButton = Button(win, text='Learn ON', width=9, font=("Calibri", 14), command=toggleLearn)
     learningBool = BooleanVar()
     learningBool.set(True)
@@ -1281,6 +4242,58 @@ def initialiseUI():
     root.mainloop()
 
 def main() -> None:
-    initialiseUI()
+    parser = ArgumentParser(description="Play Hexapawn against a learning AI. Starts the GUI unless another mode is chosen.")
+    parser.add_argument("--model", help="Load the AI from this .hexai file")
+    parser.add_argument("--serve", action="store_true", help="Host games against the AI over a line-based JSON protocol")
+    parser.add_argument("--load-test", action="store_true", help="Load test a running game server")
+    parser.add_argument("--host", default="127.0.0.1", help="Server address (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Server port (default 8765)")
+    parser.add_argument("--unix", help="Use this Unix socket path instead of TCP")
+    parser.add_argument("--no-learn", action="store_true", help="Don't let the served AI learn from games")
+    parser.add_argument("--save", help="Save the AI to this .hexai file when the server or run stops")
+    parser.add_argument("--save-base", metavar="BASE", help="Only save layouts that differ from this base: \"default\" or another .hexai file")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent load test connections (default 100)")
+    parser.add_argument("--games", type=int, default=10, help="Games per load test connection (default 10)")
+    parser.add_argument("--train", type=int, metavar="GAMES", help="Train the AI for this many games without the GUI")
+    parser.add_argument("--test", type=int, metavar="GAMES", help="Test the AI for this many games without the GUI")
+    parser.add_argument("--resume", metavar="FILE", help="Continue a paused training or testing run")
+    parser.add_argument("--ci-width", type=float, metavar="WIDTH", help="When testing, stop once the 95%% confidence interval of the win rate is this narrow")
+    parser.add_argument("--sprt", type=float, metavar="WIN_RATE", help="When testing, stop once the win rate is known to be above or below this")
+    parser.add_argument("--pause-file", default="hexapawn.hexresume", help="Where Ctrl+C pauses a run to (default hexapawn.hexresume)")
+    parser.add_argument("--analyse-logs", nargs="+", metavar="LOG", help="Summarise these logs, or every log in these directories, into a log summary file")
+    parser.add_argument("--summary", default="log-summary.npz", help="Where --analyse-logs saves its summary (default log-summary.npz)")
+    parser.add_argument("--processes", type=int, help="Processes used by --analyse-logs (default one per CPU core)")
+    parser.add_argument("--rows", type=int, default=3, help="Board rows for a new AI when training or testing (default 3)")
+    parser.add_argument("--columns", type=int, default=3, help="Board columns for a new AI when training or testing (default 3)")
+    args = parser.parse_args()
+
+    if args.serve:
+        ai = ComputerPlayer(fileSource=args.model)
+        serveGames(ai, args.host, args.port, args.unix, not args.no_learn)
+        if args.save != None: ai.exportAI(args.save, args.save_base)
+    elif args.load_test: loadTestServer(args.host, args.port, args.unix, args.clients, args.games)
+    elif args.analyse_logs != None:
+        summary = analyseLogs(args.analyse_logs, args.processes, args.summary, args.rows, args.columns)
+        print(f"{summary.games} games, AI won {round(summary.wins/max(summary.games, 1)*100, 2)} %, {len(summary.layouts)} positions. Summary saved to {args.summary}.")
+    elif args.train != None or args.test != None or args.resume != None:
+        control = PauseControl(args.pause_file if args.resume == None else args.resume)
+        monitor = None
+        if args.test != None and (args.ci_width != None or args.sprt != None): monitor = SequentialTest(args.ci_width, args.sprt)
+        if args.resume != None: monitor = readResumeMonitor(args.resume)
+        previousHandler = signal(SIGINT, lambda signalNumber, frame: control.pause())
+        try:
+            if args.resume != None: ai, wins, time = resumeGames(args.resume, control=control, monitor=monitor)
+            else:
+                ai = ComputerPlayer(fileSource=args.model, rows=args.rows, columns=args.columns)
+                wins, time = virtualiseGames(ai, args.train if args.train != None else args.test, args.train != None, monitor=monitor, control=control)
+        finally: signal(SIGINT, previousHandler)
+        if control.paused: print(f"Paused. To continue, run: python hexapawn.py --resume \"{control.resumeFile}\"")
+        else:
+            if monitor != None:
+                if monitor.reason != None: print(f"{monitor.reason}, stopped after {monitor.gamesPlayed} games.")
+                if isinstance(monitor, SequentialTest): print(f"Win rate {round(monitor.winRate*100, 2)} %, 95 % interval {round(monitor.interval[0]*100, 2)} - {round(monitor.interval[1]*100, 2)} %.")
+            print(f"Finished with {wins} wins in {round(time, 2)} seconds.")
+        if args.save != None: ai.exportAI(args.save, args.save_base)
+    else: initialiseUI(args.model)
 
 if __name__ == "__main__": main()
\ No newline at end of file
@@ -0,0 +1,15 @@
+import hexapawn
+
+
+def test_reset_board_matches_a_new_board():
+    board = hexapawn.hexBoard()
+    board.loadCaptureString("obbobowow")
+    board.overwriteAndMove(2, 0, 1, 1)
+    board.reset()
+    assert board.returnCaptureString() == hexapawn.hexBoard().returnCaptureString()
+
+
+def test_resetting_a_board_allocates_less_than_a_new_board():
+    sizes = hexapawn.measureBoardAllocations(1000)
+    assert sizes["reset"] < sizes["new_board"]
+    assert sizes["reset"] < sizes["pawn"]
@@ -0,0 +1,28 @@
+from random import seed
+
+import hexapawn
+
+
+def test_bead_player_export_and_import_round_trip(tmp_path):
+    seed(4)
+    ai = hexapawn.BeadPlayer()
+    hexapawn.virtualiseGames(ai, 500, True)
+    assert ai.beads != hexapawn.BeadPlayer().beads
+    fileName = str(tmp_path / "beads.hexai")
+    ai.exportAI(fileName)
+
+    loaded = hexapawn.BeadPlayer(fileSource=fileName)
+    assert loaded.beads == ai.beads
+    assert loaded.totals == ai.totals
+    assert loaded.layoutLookup == ai.layoutLookup
+
+    imported = hexapawn.BeadPlayer()
+    imported.importAI(fileName)
+    assert imported.beads == ai.beads
+    assert imported.layoutLookup == ai.layoutLookup
+
+    seed(5)
+    original = hexapawn.virtualiseGames(ai, 200, True)[0]
+    seed(5)
+    assert hexapawn.virtualiseGames(loaded, 200, True)[0] == original
+    assert loaded.beads == ai.beads
@@ -0,0 +1,36 @@
+from random import seed
+
+import hexapawn
+
+
+def test_side_with_no_moves_loses():
+    board = hexapawn.hexBoard(4, 4)
+    board.loadCaptureString("oboobwoowobboooo")
+    assert not hexapawn.checkEndGame(board)
+    assert not hexapawn.checkEndGame(board, False)
+    assert hexapawn.checkEndGame(board, True)
+
+
+def test_strict_moves_match_cached_games_on_4x4():
+    seed(5)
+    strict = hexapawn.ComputerPlayer(rows=4, columns=4)
+    strict.strictMoves = True
+    strictWins = hexapawn.virtualiseGames(strict, 3000, True)[0]
+    seed(5)
+    cached = hexapawn.ComputerPlayer(rows=4, columns=4)
+    cachedWins = hexapawn.virtualiseGames(cached, 3000, True)[0]
+    assert strictWins == cachedWins
+    assert strict.layoutLookup == cached.layoutLookup
+
+
+def test_generated_layouts_can_be_played_without_checks():
+    ai = hexapawn.ComputerPlayer(rows=4, columns=4)
+    masterAI = hexapawn.MasterPlayer(4, 4)
+    board = hexapawn.hexBoard(4, 4)
+    seed(5)
+    for i in range(100):
+        hexapawn.autoGame(board, ai, masterAI)
+        board.reset()
+    assert len(ai.layoutLookup) > 0
+    assert set(ai.moveCoords) == set(ai.layoutLookup)
+    assert set(masterAI.moveCoords) == set(masterAI.layoutLookup)
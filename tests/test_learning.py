@@ -0,0 +1,39 @@
+from random import seed
+
+import pytest
+
+import hexapawn
+
+
+def recordGames(gameCount: int) -> list:
+    seed(3)
+    sampler = hexapawn.OutcomeSampler(hexapawn.ComputerPlayer())
+    games = []
+    for i in range(gameCount):
+        won, plies, trajectory = sampler.sampleGame()
+        games.append(([(sampler.layouts[state], index) for state, index in trajectory], won))
+    return games
+
+
+def test_apply_batch_matches_sequential_updates():
+    games = recordGames(20)
+    sequential = hexapawn.ComputerPlayer(0.001)
+    batched = hexapawn.ComputerPlayer(0.001, batchSize=len(games))
+    for archive, won in games:
+        for ai in (sequential, batched):
+            ai.moveArchive = list(archive)
+            ai.learnFromGame(won)
+    assert batched.batchGames == 0
+    assert sequential.layoutLookup != hexapawn.ComputerPlayer().layoutLookup
+    for layout, moves in sequential.layoutLookup.items():
+        assert [move[1] for move in batched.layoutLookup[layout]] == pytest.approx([move[1] for move in moves])
+
+
+def test_apply_batch_applies_a_partial_batch():
+    games = recordGames(5)
+    ai = hexapawn.ComputerPlayer(0.001, batchSize=10)
+    for archive, won in games:
+        ai.moveArchive = list(archive)
+        assert not ai.learnFromGame(won)
+    assert ai.applyBatch()
+    assert not ai.applyBatch()
@@ -0,0 +1,41 @@
+from random import seed
+
+import hexapawn
+
+
+def test_unmaking_every_move_restores_the_board():
+    seed(2)
+    board = hexapawn.hexBoard(4, 5)
+    ai = hexapawn.ComputerPlayer(rows=4, columns=5)
+    masterAI = hexapawn.MasterPlayer(4, 5)
+    for game in range(20):
+        board.reset()
+        layouts = []
+        whiteToMove = True
+        while not hexapawn.checkEndGame(board, whiteToMove):
+            layout = board.returnCaptureString()
+            layouts.append(layout)
+            player = masterAI if whiteToMove else ai
+            player.applyMove(layout, player.pickMove(layout), board)
+            whiteToMove = not whiteToMove
+        assert board.movesMade == len(layouts)
+        while len(layouts) > 0:
+            board.unmakeMove()
+            assert board.returnCaptureString() == layouts.pop()
+        assert board.movesMade == 0
+
+
+def test_checked_and_validated_moves_can_both_be_undone():
+    board = hexapawn.hexBoard()
+    ai = hexapawn.ComputerPlayer()
+    masterAI = hexapawn.MasterPlayer()
+    masterAI.strictMoves = True
+    start = board.returnCaptureString()
+    masterAI.applyMove(start, ("B3", "B2", 1/3, 1), board)
+    middle = board.returnCaptureString()
+    ai.applyMove(middle, ai.pickMove(middle), board)
+    assert board.movesMade == 2
+    board.unmakeMove()
+    assert board.returnCaptureString() == middle
+    board.unmakeMove()
+    assert board.returnCaptureString() == start
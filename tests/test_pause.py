@@ -0,0 +1,32 @@
+from random import seed
+
+import hexapawn
+
+
+def readLog(fileName: str) -> list:
+    with open(fileName, "r") as file:
+        return file.read().splitlines()[1:]
+
+
+def test_resumed_run_matches_an_uninterrupted_run(tmp_path):
+    seed(7)
+    ai = hexapawn.ComputerPlayer(batchSize=7)
+    wins = hexapawn.virtualiseGames(ai, 1000, True, logWithName=str(tmp_path / "whole.log"))[0]
+
+    checks = []
+    def pauseAfterFiveChecks() -> None:
+        checks.append(None)
+        if len(checks) == 5: control.pause()
+    control = hexapawn.PauseControl(str(tmp_path / "run.json"), onCheck=pauseAfterFiveChecks)
+    seed(7)
+    paused = hexapawn.ComputerPlayer(batchSize=7)
+    hexapawn.virtualiseGames(paused, 1000, True, logWithName=str(tmp_path / "paused.log"), control=control)
+    assert control.paused
+    seed(123)
+    resumed, resumedWins, time = hexapawn.resumeGames(str(tmp_path / "run.json"))
+
+    assert resumedWins == wins
+    assert resumed.layoutLookup == ai.layoutLookup
+    assert resumed.benchmarkArchive == ai.benchmarkArchive
+    assert (resumed.gameCount, resumed.winCount) == (ai.gameCount, ai.winCount)
+    assert readLog(str(tmp_path / "paused.log")) == readLog(str(tmp_path / "whole.log"))
@@ -0,0 +1,26 @@
+from random import seed
+
+import hexapawn
+
+
+def test_sampled_games_match_played_games():
+    sampler = hexapawn.OutcomeSampler(hexapawn.ComputerPlayer())
+    assert sampler.validate(2000)["distance"] == 0
+
+
+def test_sampled_games_match_played_games_after_training():
+    ai = hexapawn.ComputerPlayer()
+    sampler = hexapawn.OutcomeSampler(ai)
+    hexapawn.virtualiseGames(ai, 1000, True)
+    assert sampler.validate(2000)["distance"] == 0
+
+
+def test_sampled_training_matches_virtualised_training():
+    seed(11)
+    sampled = hexapawn.ComputerPlayer(batchSize=10)
+    sampledWins = hexapawn.OutcomeSampler(sampled).playGames(3000, True)[0]
+    seed(11)
+    played = hexapawn.ComputerPlayer(batchSize=10)
+    playedWins = hexapawn.virtualiseGames(played, 3000, True)[0]
+    assert sampledWins == playedWins
+    assert sampled.layoutLookup == played.layoutLookup
@@ -0,0 +1,40 @@
+import asyncio
+from json import dumps, loads
+
+import hexapawn
+
+
+def test_malformed_sessions_and_moves_are_rejected():
+    server = hexapawn.GameServer(hexapawn.ComputerPlayer(), learn=False)
+    session = server.newGame()["session"]
+    assert "error" in server.handleRequest({"action": "move", "session": [1], "move": "A3>A2"})
+    assert "error" in server.handleRequest({"action": "quit", "session": {"id": 1}})
+    assert "error" in server.handleRequest({"action": "move", "session": session, "move": ["A3>A2"]})
+    assert session in server.sessions
+
+
+def test_sessions_are_dropped_when_a_client_disconnects(tmp_path):
+    server = hexapawn.GameServer(hexapawn.ComputerPlayer(), learn=False)
+    socketPath = str(tmp_path / "server.sock")
+
+    async def run() -> list:
+        listener = await asyncio.start_unix_server(server.handleConnection, socketPath)
+        reader, writer = await asyncio.open_unix_connection(socketPath)
+        responses = []
+        for request in ({"action": "new"}, {"action": "new"}, {"action": "move", "session": [1], "move": "A3>A2"}):
+            writer.write(dumps(request).encode()+b"\n")
+            await writer.drain()
+            responses.append(loads(await reader.readline()))
+        assert len(server.sessions) == 2
+        writer.close()
+        await writer.wait_closed()
+        for i in range(100):
+            if len(server.sessions) == 0: break
+            await asyncio.sleep(0.01)
+        listener.close()
+        await listener.wait_closed()
+        return responses
+
+    responses = asyncio.run(run())
+    assert "error" in responses[2]
+    assert server.sessions == {}